@@ -1,8 +1,10 @@
 # academics/views.py
 from django.shortcuts import render, get_object_or_404
 from .models import Department, Course
+from core.page_cache import cache_public_page
 
 
+@cache_public_page('academics')
 def department_list(request):
     departments = Department.objects.all()
     return render(request, 'academics/department_list.html', {'departments': departments})
@@ -3,4 +3,10 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'accounts'
\ No newline at end of file
+    name = 'accounts'
+
+    def ready(self):
+        from .roles import connect_role_signals
+
+        # Group and permission edits invalidate session permission caches.
+        connect_role_signals()
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth import authenticate, login
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import save_user_profile
+
+USERNAME = 'benchmark-login-user'
+PASSWORD = 'benchmark-login-password'
+
+
+def legacy_save_user_profile(sender, instance, **kwargs):
+    # The handler as it used to be: fetch and re-save the profile on every
+    # User.save().
+    if hasattr(instance, 'userprofile'):
+        instance.userprofile.save()
+
+
+class Command(BaseCommand):
+    help = ('Count the queries one login costs with the current User post_save handling '
+            'and with the old always-resave-the-profile handler. Nothing is kept.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20,
+                            help='Logins to average over for each variant (default 20).')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'handler':<12}{'queries/login':>15}{'ms/login':>10}")
+        with transaction.atomic():
+            User.objects.create_user(USERNAME, password=PASSWORD)
+            self.report('current', options['logins'])
+            post_save.disconnect(save_user_profile, sender=User)
+            post_save.connect(legacy_save_user_profile, sender=User)
+            try:
+                self.report('legacy', options['logins'])
+            finally:
+                post_save.disconnect(legacy_save_user_profile, sender=User)
+                post_save.connect(save_user_profile, sender=User)
+            transaction.set_rollback(True)
+
+    def report(self, label, logins):
+        factory = RequestFactory()
+        queries = elapsed = 0
+        for _ in range(logins):
+            request = factory.post('/accounts/login/')
+            request.session = SessionStore()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                # What accounts.views.login_view does.
+                user = authenticate(request, username=USERNAME, password=PASSWORD)
+                login(request, user)
+                request.session.save()
+                elapsed += time.perf_counter() - started
+            queries += len(captured)
+        self.stdout.write(f'{label:<12}{queries / logins:>15.1f}{elapsed * 1000 / logins:>10.1f}')
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:03
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userprofile_id_number'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.content_storage, upload_to='profiles/'),
+        ),
+    ]
@@ -4,6 +4,8 @@ from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from core.storage import content_storage
+
 class UserProfile(models.Model):
     ROLE_CHOICES = (
         ('admin', 'Admin'),
@@ -15,13 +17,41 @@ class UserProfile(models.Model):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='student')
     phone = models.CharField(max_length=20, blank=True)
     department = models.CharField(max_length=100, blank=True)
-    avatar = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    avatar = models.ImageField(upload_to='profiles/', blank=True, null=True, storage=content_storage)
     id_number = models.CharField(max_length=50, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
         return f"{self.user.username} - {self.role}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance._field_values()
+        return instance
+
+    def _field_values(self):
+        values = {}
+        for f in self._meta.concrete_fields:
+            value = self.__dict__.get(f.attname)
+            values[f.attname] = getattr(value, 'name', value)
+        return values
+
+    def changed_fields(self):
+        """Names of the fields edited since the row was loaded or saved."""
+        loaded = getattr(self, '_loaded_values', None)
+        if self._state.adding or loaded is None:
+            return [f.name for f in self._meta.concrete_fields if not f.primary_key]
+        current = self._field_values()
+        return [
+            f.name for f in self._meta.concrete_fields
+            if f.attname in loaded and current[f.attname] != loaded[f.attname]
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = self._field_values()
+
 # Automatically create UserProfile when User is created
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -29,6 +59,13 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'userprofile'):
-        instance.userprofile.save()
\ No newline at end of file
+def save_user_profile(sender, instance, created, **kwargs):
+    # Only write a profile that is already loaded on this User and has
+    # unsaved edits. Fetching it here would cost every User.save() -- the
+    # last_login update on each login included -- a SELECT and an UPDATE.
+    profile = instance._state.fields_cache.get('userprofile')
+    if created or profile is None:
+        return
+    changed = profile.changed_fields()
+    if changed:
+        profile.save(update_fields=changed)
@@ -0,0 +1,234 @@
+# accounts/roles.py
+"""Per-request user, role and permission resolution.
+
+``ProfileBackend`` loads the signed-in ``User`` and its ``UserProfile`` in one
+joined query. After that, templates that read ``user.userprofile`` (the avatar
+in base.html, for one) cost nothing more.
+
+A user's role is ``admin`` for superusers. Staff accounts get ``admin`` or
+``staff`` from ``UserProfile.role`` and fall back to ``staff``. Everyone else
+is ``student``. Access still follows the ``is_staff``/``is_superuser`` flags,
+so editing a profile can't grant staff pages to a student.
+
+``RoleMiddleware`` keeps the resolved role and the user's permission set in
+the session. Each entry is stamped with the inputs it was worked out from,
+so flipping a flag or changing a role takes effect on the next request. With
+the profile joined in, the role itself is cheap. The real saving is the
+permissions: without the session copy, every request that checks one (the
+admin, ``perms`` in templates) runs one or two queries. Group and permission
+edits replace a random version token in the cache, and any session entry
+stamped with another token is dropped. Losing the token (a restart, an
+eviction) just mints a new one, so old entries never become valid again.
+The token has to reach every worker and ``run_jobs``, so the permission set
+is only kept in the session when ``CACHES['default']`` is shared; otherwise
+it is queried per request as Django does.
+
+``role_required`` and ``staff_required`` use the request's resolved role and
+add no queries of their own.
+"""
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.middleware import get_user
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete
+from django.shortcuts import redirect
+from django.utils.functional import SimpleLazyObject
+
+from config.caches import shared_cache
+
+ROLE_SESSION_KEY = '_auth_role'
+PERMS_VERSION_KEY = 'roles:perms-version'
+BACKEND = 'accounts.roles.ProfileBackend'
+# Sessions from before ProfileBackend name the stock backend; they are moved
+# over instead of being logged out.
+LEGACY_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+SIGNED_COOKIES = 'django.contrib.sessions.backends.signed_cookies'
+
+ADMIN, STAFF, STUDENT = 'admin', 'staff', 'student'
+STAFF_ROLES = (ADMIN, STAFF)
+
+
+def resolve_role(user):
+    if not user.is_authenticated or not user.is_active:
+        return None
+    if user.is_superuser:
+        return ADMIN
+    if not user.is_staff:
+        return STUDENT
+    profile = user._state.fields_cache.get('userprofile')
+    if profile is not None and profile.role in STAFF_ROLES:
+        return profile.role
+    return STAFF
+
+
+def _stamp(user):
+    profile = user._state.fields_cache.get('userprofile')
+    return [user.pk, user.is_active, user.is_staff, user.is_superuser, profile.role if profile else None]
+
+
+def perms_version():
+    """The current permission version token, or None without a shared cache."""
+    if not shared_cache():
+        return None
+    version = cache.get(PERMS_VERSION_KEY)
+    if version is None:
+        cache.add(PERMS_VERSION_KEY, uuid4().hex, None)
+        version = cache.get(PERMS_VERSION_KEY)
+    return version
+
+
+def bump_perms_version(**kwargs):
+    """Invalidate every cached permission set; used as a signal receiver."""
+    transaction.on_commit(lambda: cache.set(PERMS_VERSION_KEY, uuid4().hex, None))
+
+
+def remember_role(sender, request, user, **kwargs):
+    """Seed the session entry at login, which saves the session anyway."""
+    if request is None or not hasattr(request, 'session'):
+        return
+    if 'userprofile' not in user._state.fields_cache:
+        # force_login() and custom login paths hand over a bare User.
+        getattr(user, 'userprofile', None)
+    request._role = resolve_role(user)
+    request.session[ROLE_SESSION_KEY] = {'stamp': _stamp(user), 'role': request._role}
+
+
+def connect_role_signals():
+    user_logged_in.connect(remember_role, dispatch_uid='roles-remember-role')
+    for through in (Group.permissions.through, Permission.user_set.through, Group.user_set.through):
+        m2m_changed.connect(bump_perms_version, sender=through, dispatch_uid=f'roles-perms-{through._meta.label}')
+    for model in (Group, Permission):
+        post_delete.connect(bump_perms_version, sender=model, dispatch_uid=f'roles-perms-{model._meta.label}')
+
+
+def _session_entry(request, user):
+    """The session's role entry if it still describes ``user``, else None."""
+    entry = request.session.get(ROLE_SESSION_KEY)
+    if isinstance(entry, dict) and entry.get('stamp') == _stamp(user):
+        return entry
+    return None
+
+
+def user_role(request):
+    """The role of ``request.user``, or None for anonymous or inactive users."""
+    if hasattr(request, '_role'):
+        return request._role
+    user = request.user
+    role = resolve_role(user)
+    if role is not None and hasattr(request, 'session'):
+        entry = _session_entry(request, user)
+        if entry is None:
+            request.session[ROLE_SESSION_KEY] = {'stamp': _stamp(user), 'role': role}
+        else:
+            role = entry['role']
+    request._role = role
+    return role
+
+
+def role_required(*roles, redirect_to='dashboard:index'):
+    """Let only users whose role is in ``roles`` through; others are redirected."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if user_role(request) not in roles:
+                return redirect(redirect_to)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+staff_required = role_required(*STAFF_ROLES)
+
+
+class ProfileBackend(ModelBackend):
+    """``ModelBackend`` that joins the profile in and reuses session permissions."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.select_related('userprofile').get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Hash anyway, so a missing username takes as long as a wrong password.
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('userprofile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def get_all_permissions(self, user_obj, obj=None):
+        cached = getattr(user_obj, '_session_perms', None)
+        if obj is None and cached is not None and not hasattr(user_obj, '_perm_cache'):
+            user_obj._perm_cache = cached
+        return super().get_all_permissions(user_obj, obj)
+
+
+class RoleMiddleware:
+    """Loads ``request.user`` through ``ProfileBackend`` with its cached permissions.
+
+    Goes right after ``AuthenticationMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        session = getattr(request, 'session', None)
+        if session is not None and session.get(BACKEND_SESSION_KEY) == LEGACY_BACKEND:
+            session[BACKEND_SESSION_KEY] = BACKEND
+        request.user = SimpleLazyObject(lambda: self.load_user(request))
+        response = self.get_response(request)
+        self.store_perms(request)
+        return response
+
+    def load_user(self, request):
+        user = get_user(request)
+        if user.is_authenticated:
+            # Read before any permission query, so a set computed while an
+            # edit lands is stored under the older version.
+            request._perms_version = perms_version()
+            entry = _session_entry(request, user)
+            if (request._perms_version is not None and entry is not None
+                    and entry.get('perms_version') == request._perms_version and 'perms' in entry):
+                user._session_perms = set(entry['perms'])
+        return user
+
+    def store_perms(self, request):
+        user = getattr(request, '_cached_user', None)
+        if user is None or not user.is_authenticated or not hasattr(request, 'session'):
+            return
+        perms = getattr(user, '_perm_cache', None)
+        if perms is None or getattr(request, '_perms_version', None) is None:
+            return
+        if perms is getattr(user, '_session_perms', None):
+            return
+        # The user may have logged out or in during the request.
+        if request.session.get(BACKEND_SESSION_KEY) is None:
+            return
+        # A long permission list could push a cookie session past 4KB.
+        if settings.SESSION_ENGINE == SIGNED_COOKIES:
+            return
+        request.session[ROLE_SESSION_KEY] = {
+            'stamp': _stamp(user), 'role': user_role(request),
+            'perms': sorted(perms), 'perms_version': request._perms_version,
+        }
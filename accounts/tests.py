@@ -1,3 +1,43 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase, override_settings
+
+from .roles import ROLE_SESSION_KEY
+
+User = get_user_model()
+
+
+class SessionPermissionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name='Editors')
+        cls.group.permissions.add(Permission.objects.get(codename='view_group'))
+        cls.user = User.objects.create_user('editor', password='pass', is_staff=True)
+        cls.user.groups.add(cls.group)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def session_perms(self):
+        self.client.get('/admin/')
+        return self.client.session[ROLE_SESSION_KEY].get('perms')
+
+    def test_per_process_cache_keeps_no_permissions_in_the_session(self):
+        self.assertIsNone(self.session_perms())
+
+    def test_group_edit_drops_the_session_copy(self):
+        # FileBasedCache is shared by every process on the host.
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+        with override_settings(CACHES=caches):
+            self.assertEqual(self.session_perms(), ['auth.view_group'])
+            with self.captureOnCommitCallbacks(execute=True):
+                self.group.permissions.clear()
+            self.assertEqual(self.session_perms(), [])
+            with self.captureOnCommitCallbacks(execute=True):
+                self.group.permissions.add(Permission.objects.get(codename='view_group'))
+            self.assertEqual(self.session_perms(), ['auth.view_group'])
@@ -6,6 +6,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms import ProfileForm
 from .forms_settings import SettingsForm
+from .roles import STAFF_ROLES, role_required
 
 def login_view(request):
     if request.method == 'POST':
@@ -42,7 +43,6 @@ def register_view(request):
             messages.error(request, 'Username is already taken.')
         else:
             user = User.objects.create_user(username=username, email=email, password=password1)
-            user.save()
             # automatically created UserProfile by signal in models.py
             profile = getattr(user, 'userprofile', None)
             if profile:
@@ -60,9 +60,8 @@ def logout_view(request):
     return redirect('/')  # Absolute path
 
 @login_required
+@role_required(*STAFF_ROLES, redirect_to='/')
 def dashboard_index(request):
-    if not request.user.is_staff and not request.user.is_superuser:
-        return redirect('/')  # Absolute path
     
     context = {
         'stats': {
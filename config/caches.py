@@ -0,0 +1,23 @@
+# config/caches.py
+"""Whether ``CACHES['default']`` is shared between processes.
+
+LocMemCache and DummyCache live inside one process. What one web worker
+stores there, and any ``delete()`` meant to invalidate it, is invisible to
+the other workers and to ``manage.py run_jobs``. Values that another process
+can change are only cached when ``shared_cache()`` is true.
+"""
+# Cache backends that live inside one process.
+PER_PROCESS_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def is_per_process(caches):
+    return caches.get('default', {}).get('BACKEND') in PER_PROCESS_CACHES
+
+
+def shared_cache():
+    """True when every process reads and writes the same default cache."""
+    from django.conf import settings
+    return not is_per_process(settings.CACHES)
@@ -0,0 +1,143 @@
+# config/database.py
+"""Database settings read from the environment.
+
+``DB_ENGINE=sqlite`` (the default) keeps the single ``db.sqlite3`` file;
+``DB_ENGINE=postgres`` reads ``DB_NAME``, ``DB_USER``, ``DB_PASSWORD``,
+``DB_HOST`` and ``DB_PORT``. For PostgreSQL, connections are kept open for
+``DB_CONN_MAX_AGE`` seconds and health-checked before reuse. ``DB_POOL``
+chooses how they are pooled:
+
+* ``native``: Django's psycopg pool (Django 5.1+), sized by
+  ``DB_POOL_MIN_SIZE`` / ``DB_POOL_MAX_SIZE``.
+* ``pgbouncer``: ``DB_HOST`` points at PgBouncer in transaction mode.
+  Server-side cursors are turned off because they don't survive it.
+
+SQLite connections get the pragmas in ``sqlite_pragmas()`` as they open.
+``busy_timeout`` makes a writer wait for the lock instead of failing at once
+with "database is locked". ``SQLITE_WAL=1`` also switches the file to WAL,
+which lets readers carry on while one writer commits, with
+``synchronous=NORMAL`` (safe under WAL) to skip the fsync on every commit.
+WAL is opt-in because it is stored in the database file itself and leaves
+``-wal``/``-shm`` files beside it: turn it on for a deployed database, not
+for a development checkout.
+
+A read replica is configured with ``DB_REPLICA_NAME`` (SQLite file or
+PostgreSQL database) and/or ``DB_REPLICA_HOST``/``DB_REPLICA_PORT``/
+``DB_REPLICA_USER``/``DB_REPLICA_PASSWORD``; unset values are taken from the
+primary. See core/replicas.py for how reads are routed to it.
+"""
+import os
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+# busy_timeout goes first so the rest wait for, rather than fail on, a lock.
+SQLITE_PRAGMA_DEFAULTS = {
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -16000,
+    'temp_store': 'MEMORY',
+}
+# Added with SQLITE_WAL=1.
+SQLITE_WAL_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+}
+
+
+def _int(env, name, default):
+    value = env.get(name, '')
+    try:
+        return int(value) if value != '' else default
+    except ValueError:
+        raise ImproperlyConfigured(f'{name} must be an integer, got {value!r}.')
+
+
+def _flag(env, name, default):
+    value = env.get(name, '')
+    if value == '':
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def sqlite_pragmas(env=os.environ):
+    """Pragmas applied to each new SQLite connection.
+
+    ``SQLITE_WAL=1`` turns on WAL, and ``SQLITE_BUSY_TIMEOUT`` /
+    ``SQLITE_MMAP_SIZE`` override the defaults.
+    """
+    pragmas = dict(SQLITE_PRAGMA_DEFAULTS)
+    if _flag(env, 'SQLITE_WAL', False):
+        pragmas.update(SQLITE_WAL_PRAGMAS)
+    pragmas['busy_timeout'] = _int(env, 'SQLITE_BUSY_TIMEOUT', pragmas['busy_timeout'])
+    pragmas['mmap_size'] = _int(env, 'SQLITE_MMAP_SIZE', pragmas['mmap_size'])
+    return pragmas
+
+
+def database_config(base_dir, env=os.environ):
+    """``DATABASES['default']`` for the environment ``env``."""
+    engine = env.get('DB_ENGINE', 'sqlite').lower()
+    if engine in ('sqlite', 'sqlite3'):
+        return {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': env.get('DB_NAME') or base_dir / 'db.sqlite3',
+            # Seconds Python's sqlite3 waits for a lock; keep it in step
+            # with the busy_timeout pragma.
+            'OPTIONS': {'timeout': sqlite_pragmas(env)['busy_timeout'] / 1000},
+        }
+    if engine not in ('postgres', 'postgresql'):
+        raise ImproperlyConfigured(f'Unsupported DB_ENGINE {engine!r}; use "sqlite" or "postgres".')
+
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.get('DB_NAME', 'norsu'),
+        'USER': env.get('DB_USER', ''),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', ''),
+        'PORT': env.get('DB_PORT', ''),
+        'CONN_MAX_AGE': _int(env, 'DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': _flag(env, 'DB_CONN_HEALTH_CHECKS', True),
+        'OPTIONS': {
+            'connect_timeout': _int(env, 'DB_CONNECT_TIMEOUT', 5),
+        },
+    }
+    pool = env.get('DB_POOL', '').lower()
+    if pool == 'native':
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured('DB_POOL=native needs Django 5.1 or later; use DB_POOL=pgbouncer.')
+        # The pool owns connection reuse, so Django must not keep its own.
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': _int(env, 'DB_POOL_MIN_SIZE', 2),
+            'max_size': _int(env, 'DB_POOL_MAX_SIZE', 10),
+        }
+    elif pool == 'pgbouncer':
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    elif pool:
+        raise ImproperlyConfigured(f'Unsupported DB_POOL {pool!r}; use "native" or "pgbouncer".')
+    return config
+
+
+def replica_config(base_dir, env=os.environ):
+    """``DATABASES['replica']``, or None when no replica is configured."""
+    if not (env.get('DB_REPLICA_NAME') or env.get('DB_REPLICA_HOST')):
+        return None
+    config = database_config(base_dir, env)
+    for key in ('NAME', 'HOST', 'PORT', 'USER', 'PASSWORD'):
+        value = env.get(f'DB_REPLICA_{key}')
+        if value:
+            config[key] = value
+    # Tests run against one database; the replica alias mirrors it.
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """``connection_created`` receiver that tunes each new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    from django.conf import settings
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
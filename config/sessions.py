@@ -0,0 +1,51 @@
+# config/sessions.py
+"""Session backend chosen from the environment.
+
+``SESSION_BACKEND`` picks one of:
+
+* ``db`` (the default): Django's own, one ``django_session`` read per
+  request.
+* ``cached_db``: sessions are read from the cache and only fall back to
+  ``django_session`` on a miss. Writes still go to both. Opt in only once
+  ``CACHES['default']`` is shared by every worker (Redis, Memcached). Each
+  worker keeps its own copy of a cached session, so with a per-process cache
+  a logout, or the ``flush()`` after a password change, would not reach the
+  other workers. Their copies would keep the session signed in for up to
+  ``SESSION_COOKIE_AGE``. ``session_engine()`` refuses that combination.
+* ``signed_cookies``: no server-side state at all. The data is signed but
+  readable by the client, and a logout can't revoke a copied cookie. Suits
+  sites that mostly serve anonymous visitors.
+
+Flash messages already travel in their own signed cookie (the messages
+``FallbackStorage``), so anonymous visitors who only see one never get a
+session row whichever backend is picked.
+
+``manage.py purge_sessions`` (or the ``core.purge_sessions`` job it can
+schedule) deletes expired ``django_session`` rows in chunks; see
+core/sessions.py.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .caches import is_per_process
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+def session_engine(caches, env=None):
+    env = os.environ if env is None else env
+    backend = env.get('SESSION_BACKEND', 'db').lower()
+    if backend not in SESSION_ENGINES:
+        raise ImproperlyConfigured(
+            f"SESSION_BACKEND must be one of {', '.join(SESSION_ENGINES)}, not {backend!r}."
+        )
+    if backend == 'cached_db' and is_per_process(caches):
+        raise ImproperlyConfigured(
+            'SESSION_BACKEND=cached_db needs a cache shared by all workers; '
+            "CACHES['default'] is per-process."
+        )
+    return SESSION_ENGINES[backend]
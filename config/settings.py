@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from .database import database_config, replica_config, sqlite_pragmas
+from .sessions import session_engine
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,14 +47,18 @@ INSTALLED_APPS = [
     'events',
     'contact',
     'dashboard',
+    'search',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.replicas.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.roles.RoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -70,6 +77,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'dashboard.context_processors.site_settings',
+                'dashboard.context_processors.notifications',
             ],
         },
     },
@@ -81,13 +89,62 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Configured from the environment (DB_ENGINE, DB_NAME, DB_HOST, DB_POOL, ...);
+# see config/database.py. Defaults to db.sqlite3.
 DATABASES = {
+    'default': database_config(BASE_DIR),
+}
+
+# Optional read replica for the public apps (DB_REPLICA_NAME / DB_REPLICA_HOST);
+# see core/replicas.py.
+REPLICA_DATABASE = replica_config(BASE_DIR)
+if REPLICA_DATABASE:
+    DATABASES['replica'] = REPLICA_DATABASE
+    DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+# Apps whose reads may go to the replica. core is left out: its models (blobs,
+# subscriptions, the heartbeat) are read back right after being written.
+REPLICA_READ_APPS = ['news', 'events', 'academics']
+# Seconds a browser keeps reading from the primary after it writes.
+REPLICA_PIN_SECONDS = 10
+# Reads fall back to the primary while the replica is further behind than
+# this many seconds; lag is re-measured every REPLICA_LAG_CHECK_INTERVAL.
+REPLICA_MAX_LAG = 30
+REPLICA_LAG_CHECK_INTERVAL = 5
+
+# Applied to every new SQLite connection (busy_timeout, mmap, and WAL with
+# SQLITE_WAL=1). Ignored on PostgreSQL.
+SQLITE_PRAGMAS = sqlite_pragmas()
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache is per-process; point this at Redis or Memcached when running
+# several workers so cached rows and invalidations are shared between them.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'norsu-default',
     }
 }
 
+# Seconds each worker keeps its own copy of the SiteSetting row before
+# re-checking the shared cache (see dashboard/settings_cache.py). With a
+# per-process cache this is also the longest a stale row can be served.
+SITE_SETTINGS_LOCAL_TTL = 30
+
+# Upper bound, in seconds, on how long anonymous public pages and home page
+# fragments stay cached (see core/page_cache.py).
+PUBLIC_CACHE_TIMEOUT = 300
+
+# Sessions: SESSION_BACKEND=db (default), cached_db (needs a shared cache)
+# or signed_cookies; see config/sessions.py. Expired rows are deleted by manage.py purge_sessions
+# and the core.purge_sessions job, this many per transaction, with a short
+# pause between chunks, once every SESSION_PURGE_INTERVAL seconds.
+SESSION_ENGINE = session_engine(CACHES)
+SESSION_PURGE_CHUNK_SIZE = 1000
+SESSION_PURGE_PAUSE = 0.05
+SESSION_PURGE_INTERVAL = 24 * 60 * 60
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -116,6 +173,7 @@ USE_I18N = True
 USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
@@ -123,23 +181,76 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 static_dirs = [BASE_DIR / 'static']
 STATICFILES_DIRS = [dir for dir in static_dirs if dir.exists()]
 
+# Outside DEBUG, collectstatic writes content-hashed names plus .gz/.br
+# copies, and config/wsgi.py serves them with far-future cache headers
+# (see core/staticfiles.py). Set SERVE_STATIC = False behind a CDN or a
+# web server that serves STATIC_ROOT itself.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'core.staticfiles.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+SERVE_STATIC = True
+# Cache lifetime, in seconds, for static files without a hashed name.
+STATIC_MAX_AGE = 60
+
 # Media files (uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Chunked uploads (see dashboard/uploads.py). Part files are assembled
+# outside MEDIA_ROOT so half-finished uploads are never served.
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'tmp' / 'uploads'
+CHUNKED_UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+CHUNKED_UPLOAD_CHUNK_SIZE = 1024 * 1024
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Resized image variants (see core/images.py), written under MEDIA_ROOT/derived/.
+IMAGE_VARIANT_FORMAT = 'webp'
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANTS_ON_SAVE = True
+
+# Email. Messages are sent by the job worker (manage.py run_jobs), never
+# inside a request; swap the console backend for SMTP in production.
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'NORSU Bayawan <no-reply@norsu-bayawan.edu.ph>'
+# Prefixed to links in notification emails, e.g. 'https://norsu-bayawan.edu.ph'.
+SITE_URL = ''
+
+# Background jobs (see jobs/queue.py).
+JOBS_WORKER_THREADS = 4
+JOBS_RETRY_BASE_DELAY = 30
+JOBS_LOCK_TIMEOUT = 300
+# Finished and failed jobs are deleted after this many days by the jobs.purge
+# job, which runs once every JOBS_PURGE_INTERVAL seconds.
+JOBS_RETENTION_DAYS = 7
+JOBS_PURGE_INTERVAL = 24 * 60 * 60
+
+# Activity log buffering (see dashboard/activity.py). A buffer size of 1
+# writes every entry straight away.
+ACTIVITY_LOG_BUFFER_SIZE = 100
+ACTIVITY_LOG_FLUSH_INTERVAL = 5
+ACTIVITY_LOG_RETENTION_DAYS = 90
+
+# Bulk student import (see dashboard/roster.py). Uploaded CSVs wait in
+# ROSTER_IMPORT_DIR for the job worker; passwords are hashed on
+# ROSTER_HASH_WORKERS processes (None: one per CPU).
+ROSTER_IMPORT_DIR = BASE_DIR / 'tmp' / 'imports'
+ROSTER_BATCH_SIZE = 500
+ROSTER_HASH_WORKERS = None
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Loads the profile with the user and keeps the role and permissions in the
+# session (see accounts/roles.py).
+AUTHENTICATION_BACKENDS = ['accounts.roles.ProfileBackend']
+
 # Login URLs
 LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'dashboard:index'
 LOGOUT_REDIRECT_URL = 'home'
 
-# Static files (CSS, JavaScript, Images)
-# https://docs.djangoproject.com/en/5.2/howto/static-files/
-
-STATIC_URL = 'static/'
-
-# Default primary key field type
-# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
-
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
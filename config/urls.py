@@ -34,6 +34,7 @@ urlpatterns = [
     path('events/', include('events.urls')),
     path('contact/', include('contact.urls')),
     path('dashboard/', include('dashboard.urls')),
+    path('search/', include('search.urls')),
     path('subscribe/', core_views.subscribe, name='subscribe'),
     re_path(r'^faculty/.*$', RedirectView.as_view(pattern_name='core:organization', permanent=False)),
     re_path(r'^staff/.*$', RedirectView.as_view(pattern_name='core:organization', permanent=False)),
@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Serve collected static files (hashed, precompressed) without a separate
+# web server or CDN; see core/staticfiles.py.
+if settings.SERVE_STATIC:
+    from core.staticfiles import StaticFilesApp
+
+    application = StaticFilesApp(application)
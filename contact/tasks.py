@@ -0,0 +1,26 @@
+# contact/tasks.py
+from django.conf import settings
+
+from dashboard.notifications import notify, staff_users
+from dashboard.settings_cache import get_site_settings
+from jobs.queue import enqueue, task
+
+from .models import ContactMessage
+
+
+@task('contact.message_received')
+def message_received(payload):
+    """Forward a contact form message to the site inbox and tell staff."""
+    message = ContactMessage.objects.filter(pk=payload['message_id']).first()
+    if message is None:
+        return
+    site = get_site_settings()
+    inbox = site.contact_email if site else settings.DEFAULT_FROM_EMAIL
+    enqueue('email.send', {
+        'to': inbox,
+        'subject': f'Contact form: {message.subject}',
+        'body': f'From: {message.name} <{message.email}>\n\n{message.message}',
+        'reply_to': message.email,
+    }, key=f"{payload['key']}:inbox")
+    notify(staff_users(), f'New contact message from {message.name}: {message.subject}', payload['key'],
+           email=False)
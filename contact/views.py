@@ -1,6 +1,8 @@
 # contact/views.py
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.db import transaction
+from jobs.queue import enqueue
 from .forms import ContactForm
 from .models import ContactMessage
 
@@ -8,7 +10,12 @@ def contact_view(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                contact_message = form.save()
+                # Emailing the inbox happens in the job worker, not here.
+                enqueue('contact.message_received', {
+                    'message_id': contact_message.pk, 'key': f'contact:{contact_message.pk}',
+                }, key=f'contact:{contact_message.pk}')
             messages.success(request, 'Thank you for your message! We will get back to you soon.')
             return redirect('contact:contact')
     else:
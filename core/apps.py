@@ -1,6 +1,20 @@
 # core/apps.py
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        # Connects the public page cache invalidation receivers.
+        from . import page_cache  # noqa: F401
+        from .images import connect_eager_variants
+        from .storage import connect_reference_tracking
+        from config.database import apply_sqlite_pragmas
+
+        # Blob reference counting and eager image variants.
+        connect_reference_tracking()
+        connect_eager_variants()
+        # WAL and friends on every new SQLite connection.
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='core-sqlite-pragmas')
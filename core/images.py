@@ -0,0 +1,149 @@
+# core/images.py
+"""Resized WebP/JPEG variants of uploaded images.
+
+Templates ask for a named preset (``{% image_url news.image "card" %}``). The
+variant lives under ``MEDIA_ROOT/derived/`` at a name derived from the source
+name and the preset, so it is generated once and then served as a plain
+media file. Until it exists the tag points at ``core:image_variant``, which
+builds it on first request; saving a model listed in ``EAGER_FIELDS`` builds
+its variants straight away instead.
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.urls import reverse
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = 'derived'
+
+# name: (max width, max height, crop to fill)
+PRESETS = {
+    'thumb': (480, 320, True),
+    'card': (800, 600, True),
+    'hero': (1600, 900, False),
+    'avatar': (160, 160, True),
+}
+
+# Which presets each image field is shown at; built on save.
+EAGER_FIELDS = {
+    'news.NewsPost': ('image', ('card', 'thumb', 'hero')),
+    'events.Event': ('image', ('card', 'thumb', 'hero')),
+    'academics.Department': ('image', ('card',)),
+    'accounts.UserProfile': ('avatar', ('avatar',)),
+}
+
+FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+# What an unreadable, truncated or oversized source raises. Pillow's
+# DecompressionBombError is neither an OSError nor a ValueError.
+VARIANT_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+# Sources the lazy view will agree to resize.
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+
+
+def _quality():
+    return getattr(settings, 'IMAGE_VARIANT_QUALITY', 80)
+
+
+def default_format():
+    fmt = getattr(settings, 'IMAGE_VARIANT_FORMAT', 'webp')
+    if fmt == 'webp' and not features.check('webp'):
+        return 'jpeg'
+    return fmt
+
+
+def variant_storage():
+    return FileSystemStorage()
+
+
+def variant_name(source_name, preset, fmt):
+    """Deterministic storage name of ``source_name`` rendered at ``preset``."""
+    width, height, crop = PRESETS[preset]
+    key = f'{source_name}|{width}x{height}|{int(crop)}|{_quality()}|{fmt}'
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return f'{DERIVED_DIR}/{preset}/{digest[:2]}/{digest}.{fmt}'
+
+
+def render_variant(source, preset, fmt):
+    """Resize the open image file ``source``; returns the encoded bytes."""
+    width, height, crop = PRESETS[preset]
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if crop:
+            image = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        else:
+            image.thumbnail((width, height), Image.LANCZOS)
+        if fmt == 'jpeg':
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        options = {'method': 4} if fmt == 'webp' else {'optimize': True, 'progressive': True}
+        out = BytesIO()
+        image.save(out, FORMATS[fmt], quality=_quality(), **options)
+    return out.getvalue()
+
+
+def build_variant(source_storage, source_name, preset, fmt=None):
+    """Generate the variant if it is missing; returns its storage name."""
+    fmt = fmt or default_format()
+    storage = variant_storage()
+    name = variant_name(source_name, preset, fmt)
+    if not storage.exists(name):
+        with source_storage.open(source_name, 'rb') as source:
+            data = render_variant(source, preset, fmt)
+        # Two concurrent first requests may both render; the second save
+        # would get a suffixed name, so only write when still missing.
+        if not storage.exists(name):
+            storage.save(name, ContentFile(data))
+    return name
+
+
+def variant_url(fieldfile, preset, fmt=None):
+    """URL of ``fieldfile`` at ``preset``, falling back to the lazy view."""
+    if not fieldfile or preset not in PRESETS:
+        return fieldfile.url if fieldfile else ''
+    fmt = fmt or default_format()
+    storage = variant_storage()
+    name = variant_name(fieldfile.name, preset, fmt)
+    if storage.exists(name):
+        return storage.url(name)
+    return reverse('core:image_variant', kwargs={'preset': preset, 'fmt': fmt, 'name': fieldfile.name})
+
+
+def build_variants(instance, field_name, presets):
+    fieldfile = getattr(instance, field_name)
+    if not fieldfile:
+        return
+    for preset in presets:
+        try:
+            build_variant(fieldfile.storage, fieldfile.name, preset)
+        except VARIANT_ERRORS:
+            # The lazy view will retry (and 404) if the source is unusable.
+            logger.warning('Could not build %s variant of %s', preset, fieldfile.name, exc_info=True)
+
+
+def _connect_eager(label, field_name, presets):
+    def build(sender, instance, **kwargs):
+        if getattr(settings, 'IMAGE_VARIANTS_ON_SAVE', True):
+            transaction.on_commit(lambda: build_variants(instance, field_name, presets))
+
+    post_save.connect(build, sender=label, weak=False, dispatch_uid=f'image-variants-{label}')
+
+
+def connect_eager_variants():
+    for label, (field_name, presets) in EAGER_FIELDS.items():
+        _connect_eager(label, field_name, presets)
@@ -0,0 +1,144 @@
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, connections
+
+from config.database import SQLITE_PRAGMA_DEFAULTS, SQLITE_WAL_PRAGMAS
+
+# What the site ran with before: SQLite's rollback journal and Python's
+# default five second lock timeout.
+SQLITE_STOCK = {'busy_timeout': 5000, 'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+# What SQLITE_WAL=1 applies.
+SQLITE_TUNED = {**SQLITE_PRAGMA_DEFAULTS, **SQLITE_WAL_PRAGMAS}
+
+BENCH_TABLE = 'core_bench_writes'
+
+
+class Command(BaseCommand):
+    help = ('Measure concurrent write throughput: SQLite with stock settings versus '
+            'the tuned pragmas, or the configured PostgreSQL with and without '
+            'persistent connections.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Concurrent writers (default 8).')
+        parser.add_argument('--writes', type=int, default=200,
+                            help='Write transactions per writer (default 200).')
+        parser.add_argument('--reads', type=int, default=2,
+                            help='Reads issued before each write, like a request would (default 2).')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'postgresql':
+            modes = [('reconnect per write', self.postgres_writer(reuse=False)),
+                     ('persistent connection', self.postgres_writer(reuse=True))]
+            self.setup_postgres()
+            try:
+                self.run_modes(modes, options)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE IF EXISTS {BENCH_TABLE}')
+            return
+
+        with tempfile.TemporaryDirectory() as tmp:
+            modes = [
+                ('sqlite stock', self.sqlite_writer(Path(tmp) / 'stock.db', SQLITE_STOCK)),
+                ('sqlite tuned', self.sqlite_writer(Path(tmp) / 'tuned.db', SQLITE_TUNED)),
+            ]
+            self.run_modes(modes, options)
+
+    def run_modes(self, modes, options):
+        self.stdout.write(f"{options['threads']} writer(s) x {options['writes']} write(s), "
+                          f"{options['reads']} read(s) per write")
+        self.stdout.write(f"{'mode':<24}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+        for label, writer in modes:
+            latencies, errors, elapsed = self.run(writer, options)
+            rate = len(latencies) / elapsed if elapsed else 0
+            p50 = statistics.median(latencies) * 1000 if latencies else 0
+            p95 = statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) > 1 else p50
+            self.stdout.write(f'{label:<24}{rate:>10.0f}{p50:>9.1f}{p95:>9.1f}{errors:>8}')
+
+    def run(self, writer, options):
+        latencies, errors = [], [0]
+        lock = threading.Lock()
+        start_gate = threading.Barrier(options['threads'])
+
+        def work(worker):
+            start_gate.wait()
+            own, failed = writer(worker, options['writes'], options['reads'])
+            with lock:
+                latencies.extend(own)
+                errors[0] += failed
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(options['threads'])]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return latencies, errors[0], time.perf_counter() - started
+
+    def sqlite_writer(self, path, pragmas):
+        setup = sqlite3.connect(path)
+        for name, value in pragmas.items():
+            setup.execute(f'PRAGMA {name} = {value}')
+        setup.execute(f'CREATE TABLE {BENCH_TABLE} (id INTEGER PRIMARY KEY, worker INTEGER, payload TEXT)')
+        setup.close()
+
+        def writer(worker, writes, reads):
+            db = sqlite3.connect(path, timeout=0, isolation_level=None, check_same_thread=False)
+            for name, value in pragmas.items():
+                db.execute(f'PRAGMA {name} = {value}')
+            latencies, failed = [], 0
+            for _ in range(writes):
+                began = time.perf_counter()
+                try:
+                    for _ in range(reads):
+                        db.execute(f'SELECT COUNT(*) FROM {BENCH_TABLE} WHERE worker = ?', (worker,)).fetchone()
+                    # A deferred BEGIN, as Django's atomic() issues on SQLite.
+                    db.execute('BEGIN')
+                    db.execute(f'INSERT INTO {BENCH_TABLE} (worker, payload) VALUES (?, ?)', (worker, 'x' * 200))
+                    db.execute('COMMIT')
+                    latencies.append(time.perf_counter() - began)
+                except sqlite3.OperationalError:
+                    failed += 1
+                    if db.in_transaction:
+                        db.execute('ROLLBACK')
+            db.close()
+            return latencies, failed
+
+        return writer
+
+    def setup_postgres(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {BENCH_TABLE}')
+            cursor.execute(f'CREATE TABLE {BENCH_TABLE} (id bigserial PRIMARY KEY, worker integer, payload text)')
+
+    def postgres_writer(self, reuse):
+        def writer(worker, writes, reads):
+            # Each thread gets its own connection from Django's handler.
+            conn = connections['default']
+            latencies, failed = [], 0
+            for _ in range(writes):
+                began = time.perf_counter()
+                try:
+                    with conn.cursor() as cursor:
+                        for _ in range(reads):
+                            cursor.execute(f'SELECT COUNT(*) FROM {BENCH_TABLE} WHERE worker = %s', [worker])
+                            cursor.fetchone()
+                        cursor.execute(f'INSERT INTO {BENCH_TABLE} (worker, payload) VALUES (%s, %s)',
+                                       [worker, 'x' * 200])
+                    latencies.append(time.perf_counter() - began)
+                except DatabaseError:
+                    failed += 1
+                if not reuse:
+                    # What CONN_MAX_AGE=0 does at the end of every request.
+                    conn.close()
+            conn.close()
+            return latencies, failed
+
+        return writer
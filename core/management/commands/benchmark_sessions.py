@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from config.sessions import SESSION_ENGINES
+
+USERNAME = 'benchmark-sessions-user'
+PASSWORD = 'benchmark-sessions-password'
+
+
+class Command(BaseCommand):
+    help = ('Measure requests/sec and queries/request of a signed-in dashboard page, and '
+            'logins/sec, with each session backend. Nothing is kept.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Page views per backend (default 200).')
+        parser.add_argument('--logins', type=int, default=10,
+                            help='Logins per backend (default 10).')
+        parser.add_argument('--backend', action='append', choices=list(SESSION_ENGINES),
+                            help='Only measure this backend; may be repeated (default all).')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'backend':<16}{'pages/s':>9}{'queries/page':>14}{'logins/s':>10}")
+        with transaction.atomic():
+            get_user_model().objects.create_user(USERNAME, password=PASSWORD, is_staff=True)
+            # One process, so cached_db is measured even on the per-process
+            # cache that session_engine() won't accept for serving.
+            for backend in options['backend'] or SESSION_ENGINES:
+                with override_settings(SESSION_ENGINE=SESSION_ENGINES[backend],
+                                       ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                    self.report(backend, options['requests'], options['logins'])
+            transaction.set_rollback(True)
+
+    def report(self, backend, requests, logins):
+        client = Client()
+        started = time.perf_counter()
+        for _ in range(logins):
+            client.login(username=USERNAME, password=PASSWORD)
+        login_rate = logins / (time.perf_counter() - started)
+
+        url = reverse('dashboard:staff_index')
+        client.get(url)  # Warm up: first-request caches and the session's role entry.
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = client.get(url)
+            elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            self.stderr.write(f'{backend}: {url} answered {response.status_code}')
+        # Drops the session from the cache too; the rows go with the rollback.
+        client.logout()
+        self.stdout.write(f'{backend:<16}{requests / elapsed:>9.1f}{len(captured) / requests:>14.1f}'
+                          f'{login_rate:>10.1f}')
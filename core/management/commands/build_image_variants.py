@@ -0,0 +1,18 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.images import EAGER_FIELDS, build_variants
+
+
+class Command(BaseCommand):
+    help = 'Pre-generate the resized variants of every news, event, department and avatar image.'
+
+    def handle(self, *args, **options):
+        total = 0
+        for label, (field_name, presets) in EAGER_FIELDS.items():
+            model = apps.get_model(label)
+            rows = model._base_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for instance in rows.only('pk', field_name).iterator():
+                build_variants(instance, field_name, presets)
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f'Checked variants for {total} image(s).'))
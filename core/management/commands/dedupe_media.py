@@ -0,0 +1,120 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import FileField
+
+from core.models import Blob
+from core.storage import content_fields, content_storage, is_blob_name
+
+
+def all_referenced_names():
+    """Every file name stored in any FileField, whatever its storage."""
+    names = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField):
+                names.update(
+                    model._base_manager.exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True).iterator()
+                )
+    names.discard('')
+    return names
+
+
+def file_sha256(storage, name):
+    digest = hashlib.sha256()
+    with storage.open(name, 'rb') as f:
+        for chunk in f.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = ('Move files referenced by content-storage fields (news images, avatars, '
+            'submissions, documents) into deduplicated blobs and repoint the rows.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Hash the files and report the savings without changing anything.')
+        parser.add_argument('--keep-originals', action='store_true',
+                            help='Leave the original files in place after their rows are repointed.')
+        parser.add_argument('--delete-unreferenced', action='store_true',
+                            help="Also delete files in these fields' upload directories that no row references.")
+
+    def handle(self, *args, **options):
+        storage = content_storage()
+        dry_run = options['dry_run']
+        seen = {}
+        moved = rows = duplicate_bytes = 0
+        originals = set()
+        upload_dirs = set()
+
+        for model, field_name in content_fields():
+            field = model._meta.get_field(field_name)
+            if isinstance(field.upload_to, str) and field.upload_to:
+                upload_dirs.add(field.upload_to.rstrip('/'))
+            names = (
+                model._base_manager.exclude(**{f'{field_name}__isnull': True})
+                .exclude(**{field_name: ''})
+                .values_list(field_name, flat=True).distinct()
+            )
+            for name in names:
+                if is_blob_name(name):
+                    continue
+                if not storage.exists(name):
+                    self.stderr.write(f'Missing file for {model._meta.label}.{field_name}: {name}')
+                    continue
+                size = storage.size(name)
+                if dry_run:
+                    sha256 = file_sha256(storage, name)
+                    duplicate_bytes += size if sha256 in seen else 0
+                    seen.setdefault(sha256, name)
+                    moved += 1
+                    continue
+                with transaction.atomic():
+                    with storage.open(name, 'rb') as f:
+                        blob, sha256, size = storage.store(File(f), os.path.splitext(name)[1])
+                    duplicate_bytes += size if sha256 in seen else 0
+                    seen.setdefault(sha256, blob)
+                    updated = model._base_manager.filter(**{field_name: name}).update(**{field_name: blob})
+                    Blob.objects.acquire(blob, sha256, size, count=updated)
+                moved += 1
+                rows += updated
+                originals.add(name)
+
+        deleted = 0
+        if not dry_run:
+            candidates = set() if options['keep_originals'] else set(originals)
+            if options['delete_unreferenced']:
+                for directory in upload_dirs:
+                    candidates.update(self.walk(storage, directory))
+                if options['keep_originals']:
+                    candidates -= originals
+            if candidates:
+                referenced = all_referenced_names()
+                for name in sorted(candidates - referenced):
+                    storage.delete(name)
+                    deleted += 1
+
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(
+                f'{moved} file(s) would become {len(seen)} blob(s), saving {duplicate_bytes} bytes.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Moved {moved} file(s) into {len(seen)} blob(s) and repointed {rows} row(s); '
+                f'deleted {deleted} old file(s); {duplicate_bytes} duplicate bytes freed.'
+            ))
+
+    def walk(self, storage, directory):
+        if not storage.exists(directory):
+            return
+        dirs, files = storage.listdir(directory)
+        for filename in files:
+            yield f'{directory}/{filename}'
+        for sub in dirs:
+            yield from self.walk(storage, f'{directory}/{sub}')
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.subscriptions import iter_csv
+
+
+class Command(BaseCommand):
+    help = 'Write the newsletter subscriber list as CSV to stdout or a file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help='File to write instead of stdout.')
+
+    def handle(self, *args, **options):
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                for line in iter_csv():
+                    f.write(line)
+        else:
+            for line in iter_csv():
+                self.stdout.write(line, ending='')
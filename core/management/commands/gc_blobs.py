@@ -0,0 +1,86 @@
+import os
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from core.models import Blob
+from core.storage import BLOB_DIR, SPOOL_DIR, content_fields, content_storage
+
+
+def referenced_names():
+    """How many rows point at each name across all content-storage fields."""
+    counts = Counter()
+    for model, field in content_fields():
+        names = model._base_manager.exclude(**{field: ''}).exclude(
+            **{f'{field}__isnull': True},
+        ).values_list(field, flat=True)
+        counts.update(names.iterator())
+    return counts
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media blobs that no row references any more.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recount', action='store_true',
+                            help='Rebuild reference counts from the model fields before collecting.')
+        parser.add_argument('--grace', type=int, default=3600,
+                            help='Leave files younger than this many seconds alone (default 3600), '
+                                 'so uploads still being saved are not collected.')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted.')
+
+    def handle(self, *args, **options):
+        storage = content_storage()
+        dry_run = options['dry_run']
+        cutoff = time.time() - options['grace']
+
+        if options['recount']:
+            self.recount(storage, dry_run)
+
+        live = set(Blob.objects.filter(refcount__gt=0).values_list('name', flat=True))
+        removed = freed = 0
+        root = storage.path(BLOB_DIR)
+        for dirpath, dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+                if name in live:
+                    continue
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                if not dry_run:
+                    if not name.startswith(f'{SPOOL_DIR}/'):
+                        Blob.objects.filter(name=name, refcount__lte=0).delete()
+                        if Blob.objects.filter(name=name).exists():
+                            continue
+                    # store() touches a blob it reuses, so a re-upload that
+                    # raced the checks above shows up as a fresh mtime.
+                    if os.stat(path).st_mtime > cutoff:
+                        continue
+                    os.remove(path)
+                removed += 1
+                freed += stat.st_size
+
+        verb = 'Would remove' if dry_run else 'Removed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} blob(s), {freed} bytes.'))
+
+    def recount(self, storage, dry_run):
+        counts = referenced_names()
+        blobs = {blob.name: blob for blob in Blob.objects.all()}
+        changed = []
+        for name, blob in blobs.items():
+            count = counts.get(name, 0)
+            if blob.refcount != count:
+                blob.refcount = count
+                changed.append(blob)
+        missing = [name for name in counts if name.startswith(f'{BLOB_DIR}/') and name not in blobs]
+        if not dry_run:
+            Blob.objects.bulk_update(changed, ['refcount'], batch_size=500)
+            for name in missing:
+                if storage.exists(name):
+                    sha256 = os.path.splitext(os.path.basename(name))[0]
+                    Blob.objects.create(name=name, sha256=sha256, size=storage.size(name),
+                                        refcount=counts[name])
+        self.stdout.write(f'Recounted references: {len(changed)} corrected, {len(missing)} missing row(s).')
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+
+from core.models import Subscription, normalize_email
+
+
+class Command(BaseCommand):
+    help = 'Import newsletter subscribers from a text file with one email address per line.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=str(settings.BASE_DIR / 'subscriptions.txt'),
+                            help='File to read (default: subscriptions.txt in the project root).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        invalid = []
+
+        def addresses(f):
+            for number, line in enumerate(f, start=1):
+                email = normalize_email(line)
+                if not email:
+                    continue
+                try:
+                    validate_email(email)
+                except ValidationError:
+                    invalid.append((number, email))
+                    continue
+                yield email
+
+        try:
+            with open(options['path'], encoding='utf-8') as f:
+                added = Subscription.objects.bulk_subscribe(
+                    addresses(f), source='import', batch_size=options['batch_size'],
+                )
+        except OSError as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+
+        for number, email in invalid:
+            self.stderr.write(f'Line {number}: skipped invalid address {email!r}')
+        self.stdout.write(self.style.SUCCESS(f'Imported {added} new subscriber(s).'))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.sessions import expired_sessions, purge_expired_sessions, schedule_session_purge
+
+
+class Command(BaseCommand):
+    help = ('Delete expired rows from django_session a chunk per transaction, so SQLite '
+            'writers are not locked out for the whole purge.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int,
+                            default=getattr(settings, 'SESSION_PURGE_CHUNK_SIZE', 1000),
+                            help='Rows deleted per transaction (default SESSION_PURGE_CHUNK_SIZE).')
+        parser.add_argument('--pause', type=float,
+                            default=getattr(settings, 'SESSION_PURGE_PAUSE', 0.05),
+                            help='Seconds to wait between chunks (default SESSION_PURGE_PAUSE).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Count the expired sessions without deleting them.')
+        parser.add_argument('--schedule', action='store_true',
+                            help='Also queue the recurring core.purge_sessions job for run_jobs.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f'{expired_sessions().count()} expired session(s) would be deleted.')
+        else:
+            removed = purge_expired_sessions(options['chunk_size'], options['pause'])
+            self.stdout.write(self.style.SUCCESS(f'Deleted {removed} expired session(s).'))
+        if options['schedule']:
+            run_at = schedule_session_purge()
+            self.stdout.write(f'Next purge queued for {run_at:%Y-%m-%d %H:%M} UTC.')
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.replicas import beat, has_replica, replica_lag
+
+
+class Command(BaseCommand):
+    help = ('Report how far the read replica is behind the primary. With --beat, first '
+            'record the heartbeat that non-PostgreSQL replicas are measured by.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--beat', action='store_true',
+                            help='Write a heartbeat on the primary (run from cron for SQLite/MySQL replicas).')
+        parser.add_argument('--watch', type=float, default=0,
+                            help='Keep reporting every this many seconds.')
+
+    def handle(self, *args, **options):
+        if not has_replica():
+            raise CommandError('No replica database is configured (set DB_REPLICA_NAME or DB_REPLICA_HOST).')
+        limit = getattr(settings, 'REPLICA_MAX_LAG', 30)
+        while True:
+            if options['beat']:
+                beat()
+            lag = replica_lag()
+            if lag is None:
+                self.stdout.write(self.style.ERROR('Replica lag unknown; public reads are using the primary.'))
+            elif lag > limit:
+                self.stdout.write(self.style.WARNING(
+                    f'Replica is {lag:.1f}s behind (limit {limit}s); public reads are using the primary.'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'Replica is {lag:.1f}s behind (limit {limit}s).'))
+            if not options['watch']:
+                break
+            time.sleep(options['watch'])
@@ -1,3 +1,93 @@
-from django.db import models
+# core/models.py
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 
-# Create your models here.
+
+class BlobQuerySet(models.QuerySet):
+    def acquire(self, name, sha256, size, count=1):
+        """Add ``count`` references to the blob stored under ``name``."""
+        if self.filter(name=name).update(refcount=F('refcount') + count):
+            return
+        try:
+            with transaction.atomic():
+                self.create(name=name, sha256=sha256, size=size, refcount=count)
+        except IntegrityError:
+            # Another writer stored the same content first.
+            self.filter(name=name).update(refcount=F('refcount') + count)
+
+    def release(self, name, count=1):
+        """Drop references to ``name``; the file goes at the next ``gc_blobs``."""
+        self.filter(name=name, refcount__gte=count).update(
+            refcount=F('refcount') - count,
+        )
+
+    def orphaned(self):
+        return self.filter(refcount__lte=0)
+
+
+class Blob(models.Model):
+    """A file in ``ContentAddressedStorage`` and how many rows point at it."""
+    name = models.CharField(max_length=100, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BlobQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+class SubscriptionQuerySet(models.QuerySet):
+    def subscribe(self, email, source='footer'):
+        """Idempotently add ``email``; returns ``(subscription, created)``."""
+        return self.get_or_create(email=normalize_email(email), defaults={'source': source})
+
+    def bulk_subscribe(self, emails, source='import', batch_size=1000):
+        """Insert any new addresses from ``emails``, skipping ones already stored."""
+        seen = set()
+        batch = []
+        for email in emails:
+            email = normalize_email(email)
+            if email and email not in seen:
+                seen.add(email)
+                batch.append(self.model(email=email, source=source))
+        before = self.count()
+        self.bulk_create(batch, batch_size=batch_size, ignore_conflicts=True)
+        return self.count() - before
+
+
+class Subscription(models.Model):
+    """A newsletter subscriber; ``email`` is always stored lower-cased."""
+    email = models.EmailField(max_length=254)
+    source = models.CharField(max_length=20, default='footer')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SubscriptionQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(Lower('email'), name='core_subscription_email_ci'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.email
+
+
+class ReplicaHeartbeat(models.Model):
+    """Single row touched on the primary; its age on a replica is the lag."""
+    beat_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Heartbeat at {self.beat_at}"
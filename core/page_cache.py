@@ -0,0 +1,181 @@
+# core/page_cache.py
+"""Cache for anonymous public pages and named template fragments.
+
+Entries are grouped by the content they render ("news", "events",
+"academics"). Each group has a version stored in the shared cache and folded
+into every key, so a write to any model in the group makes all of its pages
+and fragments unreachable at once. Because ``NewsPost.published_date`` and
+``Event.date`` can move items into or out of view without a write, entries
+touching those groups also expire at the next such boundary.
+"""
+import hashlib
+import re
+import time
+from datetime import timedelta
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import timezone
+
+# Models whose writes invalidate each group.
+GROUP_MODELS = {
+    'news': ['news.NewsPost'],
+    'events': ['events.Event'],
+    'academics': ['academics.Department', 'academics.Course'],
+}
+
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def _timeout():
+    return getattr(settings, 'PUBLIC_CACHE_TIMEOUT', 300)
+
+
+def _version_key(group):
+    return f'public:v:{group}'
+
+
+def group_versions(groups):
+    """Current version of each group, initialising any that were evicted."""
+    keys = [_version_key(g) for g in groups]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            # A fresh timestamp can't collide with a version an old entry
+            # was stored under, even if the counter itself was evicted.
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        versions.append(str(found[key]))
+    return versions
+
+
+def invalidate_groups(*groups):
+    cache.set_many({_version_key(g): time.time_ns() for g in groups}, None)
+
+
+def _next_news_change(now):
+    from news.models import NewsPost
+    return NewsPost.objects.filter(
+        is_published=True, published_date__gt=now,
+    ).aggregate(next=Min('published_date'))['next']
+
+
+def _next_event_change(now):
+    from events.models import Event
+    return Event.objects.filter(date__gte=now).aggregate(next=Min('date'))['next']
+
+
+# When, without any write, the rendered content of a group next changes.
+BOUNDARIES = {
+    'news': _next_news_change,
+    'events': _next_event_change,
+}
+
+
+def timeout_for(groups):
+    """Default timeout, shortened to the next publish/event boundary."""
+    timeout = _timeout()
+    now = timezone.now()
+    for group in groups:
+        boundary = BOUNDARIES.get(group)
+        when = boundary(now) if boundary else None
+        if when is not None:
+            seconds = (when - now) / timedelta(seconds=1)
+            timeout = min(timeout, max(int(seconds) + 1, 1))
+    return timeout
+
+
+def _key(kind, name, groups):
+    versions = '.'.join(group_versions(groups))
+    digest = hashlib.md5(name.encode('utf-8')).hexdigest()
+    return f'public:{kind}:{digest}:{versions}'
+
+
+def get_fragment(name, groups, render):
+    """Return the cached HTML for fragment ``name``, rendering it on a miss."""
+    key = _key('fragment', name, groups)
+    html = cache.get(key)
+    if html is None:
+        html = render()
+        cache.set(key, html, timeout_for(groups))
+    return html
+
+
+def _is_cacheable(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated:
+        return False
+    # Pending flash messages are rendered into the page by base.html.
+    return len(get_messages(request)) == 0
+
+
+def page_key_name(request, query=()):
+    """The URL a page is cached under: scheme, host, path and ``query`` params.
+
+    Other query parameters are dropped, so ``?utm_source=...`` or random
+    cache-busting strings share the entry of the plain URL instead of each
+    adding a new one.
+    """
+    params = sorted(
+        (name, value) for name in query for value in request.GET.getlist(name)
+    )
+    url = f'{request.scheme}://{request.get_host()}{request.path}'
+    return f'{url}?{urlencode(params)}' if params else url
+
+
+def cache_public_page(*groups, query=()):
+    """Serve anonymous GETs of the decorated view from the page cache.
+
+    ``query`` names the GET parameters the view reads; only they are part
+    of the cache key. The footer newsletter form carries a CSRF token, so
+    cached HTML gets the current visitor's token swapped in on every hit.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable(request):
+                return view(request, *args, **kwargs)
+
+            key = _key('page', page_key_name(request, query), groups)
+            cached = cache.get(key)
+            if cached is not None:
+                content = CSRF_INPUT_RE.sub(
+                    lambda m: m.group(1) + get_token(request) + m.group(2),
+                    cached['content'],
+                )
+                return HttpResponse(content, content_type=cached['content_type'])
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(key, {
+                    'content': response.content.decode(response.charset),
+                    'content_type': response['Content-Type'],
+                }, timeout_for(groups))
+            return response
+        return wrapper
+    return decorator
+
+
+def _connect_invalidation(group, model):
+    @receiver(post_save, sender=model, weak=False, dispatch_uid=f'public-cache-save-{model}')
+    @receiver(post_delete, sender=model, weak=False, dispatch_uid=f'public-cache-delete-{model}')
+    def invalidate(sender, **kwargs):
+        # Bump after commit so a concurrent miss can't re-cache the old rows
+        # under the new version.
+        transaction.on_commit(lambda: invalidate_groups(group))
+
+
+for _group, _models in GROUP_MODELS.items():
+    for _model in _models:
+        _connect_invalidation(_group, _model)
@@ -0,0 +1,83 @@
+# core/pagination.py
+"""Keyset (cursor) pagination over ``(<datetime field>, id)``, newest first.
+
+Each page is a single indexed range scan: no ``COUNT(*)`` and no ``OFFSET``,
+so page 500 costs the same as page 1. Cursors are opaque URL-safe strings
+encoding the sort key of the row at the edge of the current page.
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(obj, field):
+    raw = f'{getattr(obj, field).isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(datetime, id)``; raises ValueError on a bad cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii')
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+class KeysetPage:
+    """One page of results plus the cursors needed to move either way."""
+
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def keyset_page(queryset, per_page, field, after=None, before=None):
+    """Slice ``queryset`` (newest ``field`` first) after or before a cursor.
+
+    ``after`` walks to older rows, ``before`` back to newer ones. Pass at
+    most one; with neither the newest page is returned.
+    """
+    if before:
+        value, pk = decode_cursor(before)
+        rows = list(
+            queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk}))
+            .order_by(field, 'pk')[:per_page + 1]
+        )
+        has_more = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        return KeysetPage(
+            items,
+            next_cursor=encode_cursor(items[-1], field) if items else None,
+            previous_cursor=encode_cursor(items[0], field) if items and has_more else None,
+        )
+
+    if after:
+        value, pk = decode_cursor(after)
+        queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk}))
+    rows = list(queryset.order_by(f'-{field}', '-pk')[:per_page + 1])
+    items = rows[:per_page]
+    return KeysetPage(
+        items,
+        next_cursor=encode_cursor(items[-1], field) if len(rows) > per_page else None,
+        previous_cursor=encode_cursor(items[0], field) if items and after else None,
+    )
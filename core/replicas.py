@@ -0,0 +1,154 @@
+# core/replicas.py
+"""Read-replica routing for the public site.
+
+When ``DATABASES`` has a ``replica`` alias (see ``DB_REPLICA_*`` in
+config/database.py), ``ReplicaRouter`` sends reads of the public content apps
+in ``REPLICA_READ_APPS`` to it. Everything else, and every write, stays on
+``default``.
+
+Replicas trail the primary, so two things keep stale reads bounded:
+
+* Read-your-writes. Once a request writes anything, the rest of it reads
+  from the primary, and ``ReplicaPinMiddleware`` sets a cookie that keeps
+  that browser on the primary for ``REPLICA_PIN_SECONDS``.
+* Lag checks. ``replica_lag()`` is measured at most every
+  ``REPLICA_LAG_CHECK_INTERVAL`` seconds and shared through the cache. While
+  it is above ``REPLICA_MAX_LAG``, or can't be measured, reads fall back to
+  the primary. PostgreSQL reports its own replay lag. Other databases use a
+  heartbeat row that ``manage.py replica_status --beat`` writes on the
+  primary, so the limit must be longer than the heartbeat interval.
+"""
+import time
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+REPLICA = 'replica'
+PIN_COOKIE = 'db_pin'
+LAG_CACHE_KEY = 'replicas:lag'
+
+# Bookkeeping rows that are read back straight after being written; they stay
+# on the primary even if their app is added to REPLICA_READ_APPS.
+PRIMARY_ONLY = {'core.blob', 'core.subscription', 'core.replicaheartbeat'}
+
+_state = Local()
+
+
+def has_replica():
+    return REPLICA in settings.DATABASES
+
+
+def _read_apps():
+    return set(getattr(settings, 'REPLICA_READ_APPS', ('news', 'events', 'academics')))
+
+
+def pin_to_primary():
+    """Send the rest of this request's (or thread's) reads to the primary."""
+    _state.pinned = True
+    _state.wrote = True
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+def reset_pin(pinned=False):
+    _state.pinned = pinned
+    _state.wrote = False
+
+
+def replica_lag():
+    """Seconds the replica is behind the primary, or None if unknown."""
+    if not has_replica():
+        return None
+    conn = connections[REPLICA]
+    try:
+        if conn.vendor == 'postgresql':
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+                )
+                lag = cursor.fetchone()[0]
+            return float(lag) if lag is not None else None
+        from .models import ReplicaHeartbeat
+        beat_at = ReplicaHeartbeat.objects.using(REPLICA).filter(pk=1).values_list('beat_at', flat=True).first()
+    except DatabaseError:
+        return None
+    if beat_at is None:
+        return None
+    return max((timezone.now() - beat_at).total_seconds(), 0.0)
+
+
+def cached_replica_lag():
+    """``replica_lag()`` as last measured by any worker, refreshed on expiry."""
+    found = cache.get(LAG_CACHE_KEY)
+    if found is not None:
+        return found[0]
+    lag = replica_lag()
+    cache.set(LAG_CACHE_KEY, (lag,), getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5))
+    return lag
+
+
+def replica_usable():
+    lag = cached_replica_lag()
+    return lag is not None and lag <= getattr(settings, 'REPLICA_MAX_LAG', 30)
+
+
+def beat():
+    """Record a heartbeat on the primary for the replica to catch up with."""
+    from .models import ReplicaHeartbeat
+    ReplicaHeartbeat.objects.using('default').update_or_create(pk=1, defaults={'beat_at': timezone.now()})
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not has_replica() or is_pinned():
+            return 'default'
+        if model._meta.app_label not in _read_apps() or model._meta.label_lower in PRIMARY_ONLY:
+            return 'default'
+        # Reads inside a write transaction must see its changes.
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return REPLICA if replica_usable() else 'default'
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary.
+        return db != REPLICA
+
+
+class ReplicaPinMiddleware:
+    """Keeps a browser on the primary for a few seconds after it writes.
+
+    Sits above the session middleware so that session saves count as writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        reset_pin(pinned_until > time.time())
+        try:
+            response = self.get_response(request)
+            if getattr(_state, 'wrote', False) and has_replica():
+                seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+                response.set_cookie(PIN_COOKIE, str(int(time.time() + seconds)), max_age=seconds,
+                                    httponly=True, samesite='Lax')
+            return response
+        finally:
+            reset_pin()
@@ -0,0 +1,70 @@
+# core/sessions.py
+"""Expired-session cleanup.
+
+Django never deletes expired ``django_session`` rows by itself, and
+``clearsessions`` removes them in one statement. On SQLite that statement
+holds the write lock for as long as it runs. ``purge_expired_sessions``
+deletes ``SESSION_PURGE_CHUNK_SIZE`` rows per transaction and pauses
+``SESSION_PURGE_PAUSE`` seconds between chunks so other writers get a turn.
+
+``schedule_session_purge`` queues the ``core.purge_sessions`` job for the
+next ``SESSION_PURGE_INTERVAL`` boundary, and each run queues the one after
+it. The job key is derived from that boundary, so scheduling twice, or a
+retried run, still leaves one chain.
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.queue import enqueue
+
+PURGE_TASK = 'core.purge_sessions'
+
+
+def _chunk_size():
+    return getattr(settings, 'SESSION_PURGE_CHUNK_SIZE', 1000)
+
+
+def _pause():
+    return getattr(settings, 'SESSION_PURGE_PAUSE', 0.05)
+
+
+def _interval():
+    return getattr(settings, 'SESSION_PURGE_INTERVAL', 24 * 60 * 60)
+
+
+def expired_sessions(now=None):
+    return Session.objects.filter(expire_date__lt=now or timezone.now())
+
+
+def purge_expired_sessions(chunk_size=None, pause=None, now=None):
+    """Delete expired sessions a chunk per transaction; returns the count."""
+    chunk_size = chunk_size or _chunk_size()
+    pause = _pause() if pause is None else pause
+    now = now or timezone.now()
+    removed = 0
+    while True:
+        keys = list(expired_sessions(now).values_list('session_key', flat=True)[:chunk_size])
+        if not keys:
+            break
+        with transaction.atomic():
+            removed += expired_sessions(now).filter(session_key__in=keys).delete()[0]
+        if len(keys) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return removed
+
+
+def schedule_session_purge(now=None):
+    """Queue the next purge at the coming interval boundary; returns its time."""
+    interval = _interval()
+    now = now or timezone.now()
+    slot = int(now.timestamp() // interval) + 1
+    run_at = datetime.fromtimestamp(slot * interval, tz=dt_timezone.utc)
+    enqueue(PURGE_TASK, {}, key=f'{PURGE_TASK}:{slot}', run_at=run_at)
+    return run_at
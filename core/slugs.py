@@ -0,0 +1,117 @@
+# core/slugs.py
+"""Unique slug allocation shared by Course, NewsPost and Event.
+
+The next free slug comes from one query for the existing slugs that share
+its prefix, instead of probing ``thesis-writing-1``, ``-2``, ... one query
+at a time. Two writers can still pick the same slug at the same moment, so
+saves go through ``save_with_unique_slug``, which lets the unique constraint
+decide and tries again with a fresh suffix on ``IntegrityError``.
+``assign_slugs`` fills in a whole batch for ``bulk_create``.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+SUFFIX_RE = re.compile(r'-(\d+)$')
+# Room kept for "-<n>" when the base is cut to the column length.
+SUFFIX_ROOM = 11
+SAVE_ATTEMPTS = 5
+
+
+def _max_length(model, field):
+    return model._meta.get_field(field).max_length or 50
+
+
+def base_slug(text, max_length=50, fallback='item'):
+    return slugify(text)[:max_length].strip('-') or fallback
+
+
+def candidate(base, n, max_length):
+    """``base`` with suffix ``n``, trimmed so the result fits the column."""
+    if n == 0:
+        return base
+    suffix = f'-{n}'
+    return base[:max_length - len(suffix)].rstrip('-') + suffix
+
+
+def _stem(base, max_length):
+    return base[:max_length - SUFFIX_ROOM].rstrip('-') or base
+
+
+def _next_suffix(base, taken, max_length):
+    """0 if ``base`` itself is free, else one past the highest suffix in use."""
+    if base not in taken:
+        return 0
+    highest = 0
+    for slug in taken:
+        match = SUFFIX_RE.search(slug)
+        if match and candidate(base, int(match.group(1)), max_length) == slug:
+            highest = max(highest, int(match.group(1)))
+    return highest + 1
+
+
+def _taken(model, stems, field):
+    query = Q()
+    for stem in stems:
+        query |= Q(**{f'{field}__startswith': stem})
+    return set(model._default_manager.filter(query).values_list(field, flat=True))
+
+
+def unique_slug(model, text, field='slug'):
+    """The next free slug for ``text`` on ``model``; one query."""
+    max_length = _max_length(model, field)
+    base = base_slug(text, max_length)
+    taken = _taken(model, [_stem(base, max_length)], field)
+    return candidate(base, _next_suffix(base, taken, max_length), max_length)
+
+
+def save_with_unique_slug(instance, text, save, field='slug'):
+    """Give ``instance`` a free slug and ``save()`` it, retrying on a clash."""
+    model = type(instance)
+    for attempt in range(SAVE_ATTEMPTS):
+        slug = unique_slug(model, text, field)
+        setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            # Only a slug another writer took in the meantime is worth
+            # another go; any other constraint failure is the caller's.
+            clashed = model._default_manager.filter(**{field: slug}).exclude(pk=instance.pk).exists()
+            if not clashed or attempt == SAVE_ATTEMPTS - 1:
+                raise
+
+
+def assign_slugs(objs, source='title', field='slug'):
+    """Fill in the blank slugs of unsaved ``objs`` ahead of ``bulk_create``.
+
+    Existing slugs are read with one query per 100 distinct prefixes, and
+    duplicates inside the batch get consecutive suffixes. A concurrent writer
+    can still win a slug; run the import again or insert row by row then.
+    """
+    objs = [obj for obj in objs if not getattr(obj, field)]
+    if not objs:
+        return objs
+    model = type(objs[0])
+    max_length = _max_length(model, field)
+    bases = {id(obj): base_slug(getattr(obj, source), max_length) for obj in objs}
+    stems = sorted({_stem(base, max_length) for base in bases.values()})
+    taken = set()
+    for start in range(0, len(stems), 100):
+        taken |= _taken(model, stems[start:start + 100], field)
+
+    following = {}
+    for obj in objs:
+        base = bases[id(obj)]
+        if base not in following:
+            following[base] = _next_suffix(base, taken, max_length)
+        n = following[base]
+        while candidate(base, n, max_length) in taken:
+            n += 1
+        slug = candidate(base, n, max_length)
+        taken.add(slug)
+        following[base] = n + 1
+        setattr(obj, field, slug)
+    return objs
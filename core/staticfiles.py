@@ -0,0 +1,199 @@
+# core/staticfiles.py
+"""Production static files: hashed names, precompression and a WSGI server.
+
+``collectstatic`` with ``CompressedManifestStaticFilesStorage`` writes every
+file under a content-hashed name (``css/site.3f2a9c1b.css``), as
+``ManifestStaticFilesStorage`` does. It also writes ``.gz`` and, when the
+``brotli`` package is installed, ``.br`` copies of anything that shrinks.
+
+``StaticFilesApp`` wraps the Django WSGI application and answers requests
+under ``STATIC_URL`` straight from ``STATIC_ROOT``. It picks the smallest
+encoding the client accepts. Hashed names are sent as ``immutable`` with a
+one year lifetime, because a changed file gets a new name. Anything else gets
+a short max-age and an ETag. The file index is built once at start-up, so a
+new ``collectstatic`` needs a worker restart (which a deploy does anyway).
+"""
+import gzip
+import json
+import logging
+import mimetypes
+import os
+from email.utils import formatdate
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip alone is still served.
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Already compressed; another pass only costs CPU.
+SKIP_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.ico', '.woff', '.woff2',
+    '.zip', '.gz', '.br', '.mp4', '.webm', '.mp3', '.pdf',
+}
+# A compressed copy is only kept if it saves at least this fraction.
+MIN_SAVING = 0.05
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def _short_cache():
+    return f"public, max-age={getattr(settings, 'STATIC_MAX_AGE', 60)}"
+
+
+def compressible(name):
+    return os.path.splitext(name)[1].lower() not in SKIP_EXTENSIONS
+
+
+def compress(data):
+    """``{'gz': bytes, 'br': bytes}`` for the encodings that pay off."""
+    variants = {'gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    limit = len(data) * (1 - MIN_SAVING)
+    return {ext: body for ext, body in variants.items() if len(body) < limit}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # Compress the final hashed files and the plain copies next to them.
+        names = set(self.hashed_files.values()) | set(self.hashed_files)
+        for name in sorted(names):
+            if not compressible(name) or not self.exists(name):
+                continue
+            with self.open(name) as original:
+                data = original.read()
+            for ext, body in compress(data).items():
+                target = f'{name}.{ext}'
+                if self.exists(target):
+                    self.delete(target)
+                self._save(target, ContentFile(body))
+
+    def stored_name(self, name):
+        # A template pointing at a file that was never shipped shouldn't
+        # take the page down; it 404s as it did before hashing.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            logger.warning('Static file %s is missing from the manifest', name)
+            return name
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'image/svg+xml'):
+            self.content_type += '; charset=utf-8'
+        self.etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.cache_control = IMMUTABLE if immutable else _short_cache()
+        # (encoding, path, size), smallest first.
+        self.encodings = []
+        for encoding, ext in (('br', '.br'), ('gzip', '.gz')):
+            if os.path.exists(path + ext):
+                self.encodings.append((encoding, path + ext, os.path.getsize(path + ext)))
+        self.encodings.sort(key=lambda item: item[2])
+
+    def choose(self, accept_encoding):
+        accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+        for encoding, path, size in self.encodings:
+            if encoding in accepted:
+                return encoding, path, size
+        return None, self.path, self.size
+
+
+def _hashed_names(root):
+    """Names written by the manifest storage, which never change content."""
+    try:
+        with open(os.path.join(root, ManifestStaticFilesStorage.manifest_name)) as fh:
+            return set(json.load(fh).get('paths', {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+def build_index(root, prefix):
+    """Map URL paths under ``prefix`` to ``StaticFile`` entries."""
+    index = {}
+    if not root or not os.path.isdir(root):
+        return index
+    hashed = _hashed_names(root)
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            if filename.endswith(('.gz', '.br')):
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            index[prefix + name] = StaticFile(path, immutable=name in hashed)
+    return index
+
+
+class StaticFilesApp:
+    """WSGI middleware serving ``STATIC_ROOT``; everything else goes to Django."""
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        prefix = prefix or settings.STATIC_URL
+        if not prefix.startswith('/'):
+            prefix = '/' + prefix
+        self.prefix = prefix if prefix.endswith('/') else prefix + '/'
+        self.files = build_index(str(root or settings.STATIC_ROOT or ''), self.prefix)
+
+    def __call__(self, environ, start_response):
+        try:
+            # WSGI hands PATH_INFO over as latin-1 decoded bytes.
+            path = environ.get('PATH_INFO', '').encode('latin-1').decode('utf-8')
+        except UnicodeError:
+            return self.application(environ, start_response)
+        static = self.files.get(path) if path.startswith(self.prefix) else None
+        if static is None:
+            return self.application(environ, start_response)
+        return self.serve(static, environ, start_response)
+
+    def serve(self, static, environ, start_response):
+        method = environ.get('REQUEST_METHOD', 'GET')
+        if method not in ('GET', 'HEAD'):
+            start_response('405 Method Not Allowed', [('Allow', 'GET, HEAD'), ('Content-Length', '0')])
+            return []
+        headers = [
+            ('Cache-Control', static.cache_control),
+            ('ETag', static.etag),
+            ('Last-Modified', static.last_modified),
+        ]
+        if static.encodings:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if static.etag in environ.get('HTTP_IF_NONE_MATCH', ''):
+            start_response('304 Not Modified', headers)
+            return []
+        encoding, path, size = static.choose(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        headers += [('Content-Type', static.content_type), ('Content-Length', str(size))]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        start_response('200 OK', headers)
+        if method == 'HEAD':
+            return []
+        fh = open(path, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None:
+            return file_wrapper(fh, 64 * 1024)
+        return _iter_file(fh)
+
+
+def _iter_file(fh, block_size=64 * 1024):
+    with fh:
+        while True:
+            block = fh.read(block_size)
+            if not block:
+                return
+            yield block
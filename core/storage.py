@@ -0,0 +1,187 @@
+# core/storage.py
+"""Content-addressed, deduplicating media storage.
+
+Files are stored once under ``blobs/<aa>/<sha256><ext>`` however many times
+they are uploaded, and a ``core.Blob`` row counts the model fields pointing
+at each one. References follow field values, not saves: a row that is
+created with a file, or whose file changes, adds one to the new blob and
+drops one from the old. Re-saving a row, or uploading the same content it
+already has, leaves the count alone. Files are never removed inline
+(another row may be about to reuse the same content); ``gc_blobs`` deletes
+blobs whose count has reached zero.
+
+Blob names say nothing about the upload, so models whose files are
+downloaded keep the client's name themselves (see ``uploaded_name``).
+"""
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db.models import F, FileField
+from django.db.models.signals import post_delete, post_init, post_save
+
+BLOB_DIR = 'blobs'
+SPOOL_DIR = f'{BLOB_DIR}/tmp'
+
+
+def blob_name(sha256, ext=''):
+    return f'{BLOB_DIR}/{sha256[:2]}/{sha256}{ext.lower()}'
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f'{BLOB_DIR}/') and not name.startswith(f'{SPOOL_DIR}/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save, so there is
+        # nothing to make unique here.
+        return name
+
+    def _save(self, name, content):
+        from .models import Blob
+        name, sha256, size = self.store(content, os.path.splitext(name)[1])
+        # Only record the blob; the row's post_save adds the reference.
+        Blob.objects.acquire(name, sha256, size, count=0)
+        return name
+
+    def store(self, content, ext=''):
+        """Write ``content`` to its blob without touching reference counts.
+
+        Returns ``(name, sha256, size)``. The data is spooled to a temporary
+        file next to the blobs and renamed into place, so readers never see a
+        partially written blob.
+        """
+        spool_dir = self.path(SPOOL_DIR)
+        os.makedirs(spool_dir, exist_ok=True)
+        fd, spool_path = tempfile.mkstemp(dir=spool_dir)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as spool:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    spool.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            name = blob_name(sha256, ext)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(spool_path)
+                # Mark the blob as in use so gc_blobs leaves it alone.
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(spool_path, self.file_permissions_mode)
+                os.replace(spool_path, path)
+        except BaseException:
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+            raise
+        return name, sha256, size
+
+    def delete(self, name):
+        # FieldFile.delete() lands here. The blob may still be shared, and
+        # the row's post_save releases its reference once the cleared field
+        # is saved, so nothing happens to blobs here.
+        if not is_blob_name(name):
+            super().delete(name)
+
+
+def uploaded_name(fieldfile, default=''):
+    """The client's name for a file about to be stored, else ``default``."""
+    if fieldfile and not fieldfile._committed:
+        return os.path.basename(fieldfile.name)[:255]
+    return default
+
+
+_storage = None
+
+
+def content_storage():
+    """Storage callable for ``FileField(storage=...)``; one shared instance."""
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage(
+            location=getattr(settings, 'CONTENT_STORAGE_ROOT', None),
+        )
+    return _storage
+
+
+def content_fields():
+    """``(model, field_name)`` for every field stored in content storage."""
+    fields = []
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage):
+                fields.append((model, field.name))
+    return fields
+
+
+# Reference tracking. The names loaded with an instance are remembered so a
+# save that replaces the file releases the old blob.
+
+def _loaded_names(sender, instance, **kwargs):
+    names = {}
+    for name in sender._blob_fields:
+        value = instance.__dict__.get(name)
+        names[name] = getattr(value, 'name', value)
+    instance._blob_names = names
+
+
+def _add_reference(name):
+    from .models import Blob
+    if Blob.objects.filter(name=name).update(refcount=F('refcount') + 1):
+        return
+    # A name copied from a row saved before reference counting existed.
+    storage = content_storage()
+    if storage.exists(name):
+        sha256 = os.path.splitext(os.path.basename(name))[0]
+        Blob.objects.acquire(name, sha256, storage.size(name))
+
+
+def _saved(sender, instance, created, **kwargs):
+    from .models import Blob
+    # A new row holds nothing yet, including a copy saved with pk=None.
+    loaded = {} if created else getattr(instance, '_blob_names', {})
+    deferred = instance.get_deferred_fields()
+    for name in sender._blob_fields:
+        if name in deferred:
+            continue
+        current = getattr(instance, name).name
+        previous = loaded.get(name)
+        if previous != current:
+            if is_blob_name(current):
+                _add_reference(current)
+            if is_blob_name(previous):
+                Blob.objects.release(previous)
+        loaded[name] = current
+    instance._blob_names = loaded
+
+
+def _deleted(sender, instance, **kwargs):
+    from .models import Blob
+    deferred = instance.get_deferred_fields()
+    for name in sender._blob_fields:
+        if name in deferred:
+            continue
+        current = getattr(instance, name).name
+        if is_blob_name(current):
+            Blob.objects.release(current)
+
+
+def connect_reference_tracking():
+    tracked = {}
+    for model, name in content_fields():
+        tracked.setdefault(model, []).append(name)
+    for model, names in tracked.items():
+        model._blob_fields = tuple(names)
+        uid = f'content-storage-{model._meta.label_lower}'
+        post_init.connect(_loaded_names, sender=model, dispatch_uid=uid)
+        post_save.connect(_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(_deleted, sender=model, dispatch_uid=uid)
@@ -0,0 +1,23 @@
+# core/subscriptions.py
+"""Streaming CSV export of newsletter subscribers."""
+import csv
+
+from .models import Subscription
+
+EXPORT_HEADER = ['email', 'source', 'subscribed_at']
+
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(chunk_size=2000):
+    """Yield the subscriber list as CSV lines, reading rows in chunks."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    rows = Subscription.objects.order_by('id').values_list('email', 'source', 'created_at')
+    for email, source, created_at in rows.iterator(chunk_size=chunk_size):
+        yield writer.writerow([email, source, created_at.isoformat()])
@@ -0,0 +1,12 @@
+# core/tasks.py
+"""Background handlers for core housekeeping (see jobs/queue.py)."""
+from jobs.queue import task
+
+from .sessions import PURGE_TASK, purge_expired_sessions, schedule_session_purge
+
+
+@task(PURGE_TASK, atomic=False)
+def purge_sessions(payload):
+    # Queue the next run first, so a failing purge doesn't end the chain.
+    schedule_session_purge()
+    purge_expired_sessions()
@@ -0,0 +1,18 @@
+# core/templatetags/images.py
+from django import template
+
+from core.images import variant_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_url(fieldfile, preset, fmt=None):
+    """URL of an uploaded image resized to ``preset`` (see core/images.py).
+
+    Usage::
+
+        {% load images %}
+        <img src="{% image_url news.image "card" %}" ...>
+    """
+    return variant_url(fieldfile, preset, fmt)
@@ -0,0 +1,42 @@
+# core/templatetags/public_cache.py
+from django import template
+
+from core.page_cache import get_fragment
+
+register = template.Library()
+
+
+class PublicFragmentNode(template.Node):
+    def __init__(self, nodelist, name, groups):
+        self.nodelist = nodelist
+        self.name = name
+        self.groups = groups
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        groups = [g.resolve(context) for g in self.groups]
+        return get_fragment(name, groups, lambda: self.nodelist.render(context))
+
+
+@register.tag
+def publicfragment(parser, token):
+    """Cache a named block of template output until its groups change.
+
+    Usage::
+
+        {% publicfragment "home:latest-news" "news" %}
+            ...
+        {% endpublicfragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "'%s' tag requires a fragment name and at least one group." % bits[0]
+        )
+    nodelist = parser.parse(('endpublicfragment',))
+    parser.delete_first_token()
+    return PublicFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
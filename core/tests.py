@@ -1,3 +1,80 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from news.models import NewsPost
+
+from . import replicas
+from .models import Subscription
+from .replicas import PIN_COOKIE, REPLICA, ReplicaPinMiddleware, ReplicaRouter
+
+
+@override_settings(REPLICA_MAX_LAG=30, REPLICA_LAG_CHECK_INTERVAL=5, REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    # Not TestCase: its wrapping transaction would keep every read on the
+    # primary.
+    databases = {'default'}
+
+    def setUp(self):
+        cache.delete(replicas.LAG_CACHE_KEY)
+        replicas.reset_pin()
+        self.addCleanup(replicas.reset_pin)
+        patcher = mock.patch.object(replicas, 'has_replica', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+
+    def lag(self, seconds):
+        return mock.patch.object(replicas, 'replica_lag', return_value=seconds)
+
+    def test_public_reads_go_to_the_replica(self):
+        with self.lag(1.0):
+            self.assertEqual(self.router.db_for_read(NewsPost), REPLICA)
+            self.assertEqual(self.router.db_for_read(Subscription), 'default')
+
+    def test_writes_pin_the_rest_of_the_request(self):
+        with self.lag(1.0):
+            self.assertEqual(self.router.db_for_write(NewsPost), 'default')
+            self.assertEqual(self.router.db_for_read(NewsPost), 'default')
+
+    def test_reads_inside_a_transaction_stay_on_the_primary(self):
+        with self.lag(1.0), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(NewsPost), 'default')
+
+    def test_lagging_or_unknown_replica_falls_back(self):
+        for lag in (31.0, None):
+            cache.delete(replicas.LAG_CACHE_KEY)
+            with self.lag(lag):
+                self.assertEqual(self.router.db_for_read(NewsPost), 'default')
+
+    def test_lag_is_measured_once_per_interval(self):
+        with self.lag(1.0) as measure:
+            self.router.db_for_read(NewsPost)
+            self.router.db_for_read(NewsPost)
+        self.assertEqual(measure.call_count, 1)
+
+    def test_pin_cookie_keeps_the_browser_on_the_primary(self):
+        seen = []
+
+        def view(request):
+            seen.append(replicas.is_pinned())
+            if request.method == 'POST':
+                self.router.db_for_write(NewsPost)
+            return HttpResponse()
+
+        middleware = ReplicaPinMiddleware(view)
+        factory = RequestFactory()
+        response = middleware(factory.post('/'))
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertFalse(replicas.is_pinned())
+
+        factory.cookies[PIN_COOKIE] = cookie.value
+        self.assertNotIn(PIN_COOKIE, middleware(factory.get('/')).cookies)
+        factory.cookies[PIN_COOKIE] = str(int(time.time()) - 1)
+        middleware(factory.get('/'))
+        self.assertEqual(seen, [False, True, False])
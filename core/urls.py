@@ -16,4 +16,5 @@ urlpatterns = [
     path('sitemap/', views.sitemap, name='sitemap'),
     path('accessibility/', views.accessibility, name='accessibility'),
     path('downloads/', views.downloads, name='downloads'),
+    path('images/<str:preset>.<str:fmt>/<path:name>', views.image_variant, name='image_variant'),
 ]
@@ -1,26 +1,29 @@
 # core/views.py
 from django.shortcuts import render, redirect
+from django.http import Http404
 from django.utils import timezone
 from django.contrib import messages
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.db import DatabaseError
+import logging
 import os
 
-def home(request):
-    # Initialize empty lists
-    latest_news = []
-    upcoming_events = []
-    
-    # Try to get news data
+from .images import FORMATS, IMAGE_EXTENSIONS, PRESETS, VARIANT_ERRORS, build_variant, variant_storage
+from .models import Subscription
+from .page_cache import cache_public_page
+
+logger = logging.getLogger(__name__)
+
+
+def _latest_news():
     try:
         from news.models import NewsPost
-        latest_news = list(NewsPost.objects.filter(
-            is_published=True
-        ).select_related('author').order_by('-published_date')[:5])
+        return list(NewsPost.objects.published().select_related('author').order_by('-published_date')[:5])
     except Exception as e:
         # Fallback data
-        latest_news = [
+        return [
             {
                 'title': 'Welcome to NORSU Bayawan Campus',
                 'excerpt': 'We are excited to welcome new students to our campus for the upcoming academic year.',
@@ -36,16 +39,17 @@ def home(request):
                 'get_absolute_url': '#',
             }
         ]
-    
-    # Try to get events data
+
+
+def _upcoming_events():
     try:
         from events.models import Event
-        upcoming_events = list(Event.objects.filter(
+        return list(Event.objects.filter(
             date__gte=timezone.now()
         ).order_by('date')[:5])
     except Exception as e:
         # Fallback data
-        upcoming_events = [
+        return [
             {
                 'title': 'Campus Orientation Day',
                 'description': 'Orientation program for all new students joining NORSU Bayawan.',
@@ -55,10 +59,15 @@ def home(request):
                 'get_absolute_url': '#',
             }
         ]
-    
+
+
+@cache_public_page('news', 'events')
+def home(request):
+    # Passed as callables so the queries only run when the template renders
+    # a fragment that isn't already cached.
     context = {
-        'latest_news': latest_news,
-        'upcoming_events': upcoming_events,
+        'latest_news': _latest_news,
+        'upcoming_events': _upcoming_events,
     }
     return render(request, 'core/home.html', context)
 
@@ -164,6 +173,7 @@ def subscribe(request):
     """Handle newsletter subscription form POST from footer.
 
     - Expects `email` in POST data.
+    - Stores it once in `Subscription`; repeat sign-ups are reported, not duplicated.
     - On success, sets a success message and redirects back to the referring page.
     """
     if request.method != 'POST':
@@ -180,14 +190,16 @@ def subscribe(request):
         messages.error(request, 'Please provide a valid email address.')
         return redirect(request.META.get('HTTP_REFERER', '/'))
 
-    # Minimal handling: record subscription in a plain text file (simple, non-blocking)
     try:
-        subscriptions_file = 'subscriptions.txt'
-        with open(subscriptions_file, 'a', encoding='utf-8') as f:
-            f.write(email + '\n')
-    except Exception:
-        # If writing fails, still show success to the user but log could be added.
-        pass
+        _, created = Subscription.objects.subscribe(email)
+    except DatabaseError:
+        logger.exception('Could not store newsletter subscription')
+        messages.error(request, 'Sorry, we could not subscribe you right now. Please try again later.')
+        return redirect(request.META.get('HTTP_REFERER', '/'))
+
+    if not created:
+        messages.info(request, 'You are already subscribed to our newsletter.')
+        return redirect(request.META.get('HTTP_REFERER', '/'))
 
     messages.success(request, 'Thanks — you have been subscribed to our newsletter.')
     return redirect(request.META.get('HTTP_REFERER', '/'))
@@ -238,3 +250,18 @@ def downloads(request):
             })
 
     return render(request, 'core/downloads.html', {'files': files})
+
+
+def image_variant(request, preset, fmt, name):
+    """Build a resized image variant on first request and redirect to it."""
+    if (preset not in PRESETS or fmt not in FORMATS
+            or os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS):
+        raise Http404('Unknown image variant.')
+    source_storage = variant_storage()
+    try:
+        if not source_storage.exists(name):
+            raise Http404('Image not found.')
+        variant = build_variant(source_storage, name, preset, fmt)
+    except VARIANT_ERRORS as exc:
+        raise Http404('Image could not be resized.') from exc
+    return redirect(variant_storage().url(variant))
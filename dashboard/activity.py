@@ -0,0 +1,121 @@
+# dashboard/activity.py
+"""Buffered writer for ``ActivityLog``.
+
+Views call ``log_activity(user, 'enrollment.join', course.title)``; the entry
+is kept in a per-process buffer and written with one ``bulk_create`` once
+``ACTIVITY_LOG_BUFFER_SIZE`` entries have piled up, or at the end of the
+first request after ``ACTIVITY_LOG_FLUSH_INTERVAL`` seconds. An atexit hook
+writes whatever is left when the worker shuts down, so a graceful restart
+loses nothing; a killed process loses at most one buffer.
+
+Entries carry their own timestamp, taken when the action happened rather
+than when the batch was written.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, close_old_connections, connection
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+
+def _buffer_size():
+    return getattr(settings, 'ACTIVITY_LOG_BUFFER_SIZE', 100)
+
+
+def _flush_interval():
+    return getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL', 5)
+
+
+class ActivityBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = []
+        self._last_flush = time.monotonic()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            full = len(self._entries) >= _buffer_size()
+        if full:
+            self.flush()
+
+    def due(self):
+        return bool(self._entries) and time.monotonic() - self._last_flush >= _flush_interval()
+
+    def flush(self):
+        """Write the buffered entries; returns how many were written."""
+        with self._lock:
+            entries, self._entries = self._entries, []
+            self._last_flush = time.monotonic()
+        if not entries:
+            return 0
+        try:
+            ActivityLog.objects.bulk_create(entries, batch_size=500)
+        except DatabaseError:
+            # The log is best effort; never fail a request over it.
+            logger.exception('Dropped %d activity log entries', len(entries))
+            return 0
+        return len(entries)
+
+
+_buffer = ActivityBuffer()
+
+
+def log_activity(user, action, detail=''):
+    """Record that ``user`` did ``action`` (a short dotted code)."""
+    entry = ActivityLog(
+        user_id=getattr(user, 'pk', None),
+        action=action[:255],
+        detail=detail[:255],
+        timestamp=timezone.now(),
+    )
+    if _buffer_size() <= 1:
+        ActivityLog.objects.bulk_create([entry])
+    else:
+        _buffer.add(entry)
+
+
+def flush():
+    return _buffer.flush()
+
+
+def pending():
+    return len(_buffer)
+
+
+def _flush_if_due(sender, **kwargs):
+    # request_finished fires after the response has gone out, so the write
+    # is off the request's critical path. Django's own request_finished
+    # receiver has already closed the request's connection by now, so the
+    # flush opens a new one; close it the same way, or it would sit idle
+    # until the next request regardless of CONN_MAX_AGE.
+    if _buffer.due():
+        try:
+            _buffer.flush()
+        finally:
+            close_old_connections()
+
+
+def _flush_at_exit():
+    if not len(_buffer):
+        return
+    try:
+        _buffer.flush()
+    finally:
+        connection.close()
+
+
+def connect_activity_buffer():
+    request_finished.connect(_flush_if_due, dispatch_uid='dashboard-activity-flush')
+    atexit.register(_flush_at_exit)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+
+    def ready(self):
+        from .activity import connect_activity_buffer
+
+        # Flushes buffered ActivityLog entries at request end and on exit.
+        connect_activity_buffer()
@@ -1,8 +1,18 @@
 # dashboard/context_processors.py
+from .settings_cache import get_site_settings
+
+
 def site_settings(request):
     try:
-        from .models import SiteSetting
-        settings = SiteSetting.objects.first()
-        return {'site_settings': settings}
-    except:
-        return {'site_settings': None}
\ No newline at end of file
+        return {'site_settings': get_site_settings()}
+    except Exception:
+        return {'site_settings': None}
+
+
+def notifications(request):
+    """Unread badge count for base.html; see notifications.unread_count."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    from .notifications import unread_count
+    return {'unread_notification_count': unread_count(user)}
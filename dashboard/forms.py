@@ -1,9 +1,66 @@
 from django import forms
-from .models import Submission, Ticket, Announcement, Document
+from .models import Submission, Ticket, Announcement, Document, ChunkedUpload
+from .uploads import discard_upload, open_upload
 from django.contrib.auth import get_user_model
 
 
-class SubmissionForm(forms.ModelForm):
+class ChunkedUploadFormMixin:
+    """Let file fields be filled from a completed chunked upload.
+
+    Each field named in ``chunked_file_fields`` gets a hidden ``<name>_upload``
+    companion holding a ChunkedUpload id. The view passes ``uploader=`` so
+    only the user's own completed uploads are accepted, and calls
+    ``release_uploads()`` once the instance is saved. ``close_uploads()``
+    closes the part files opened by ``clean()``; views call it in a
+    ``finally`` so an invalid form or a failed save doesn't leak them.
+    """
+    chunked_file_fields = ()
+
+    def __init__(self, *args, uploader=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.uploader = uploader
+        self._chunked_uploads = []
+        self._opened_files = []
+        for name in self.chunked_file_fields:
+            upload_field = f'{name}_upload'
+            self.fields[upload_field] = forms.UUIDField(required=False, widget=forms.HiddenInput)
+            if self.data.get(self.add_prefix(upload_field)):
+                self.fields[name].required = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name in self.chunked_file_fields:
+            upload_id = cleaned_data.get(f'{name}_upload')
+            if not upload_id or cleaned_data.get(name):
+                continue
+            upload = ChunkedUpload.objects.filter(
+                pk=upload_id, owner=self.uploader, completed_at__isnull=False,
+            ).first() if self.uploader else None
+            if upload is None:
+                self.add_error(name, 'The uploaded file could not be found. Please upload it again.')
+                continue
+            self._opened_files.append(open_upload(upload))
+            cleaned_data[name] = self._opened_files[-1]
+            self._chunked_uploads.append(upload)
+        return cleaned_data
+
+    def close_uploads(self):
+        """Close the part files opened by ``clean()``; safe to call twice."""
+        for f in self._opened_files:
+            f.close()
+        self._opened_files = []
+
+    def release_uploads(self):
+        """Close and delete the part files once their contents have been stored."""
+        self.close_uploads()
+        for upload in self._chunked_uploads:
+            discard_upload(upload)
+        self._chunked_uploads = []
+
+
+class SubmissionForm(ChunkedUploadFormMixin, forms.ModelForm):
+    chunked_file_fields = ('file',)
+
     class Meta:
         model = Submission
         fields = ['file', 'text']
@@ -30,7 +87,9 @@ class AnnouncementForm(forms.ModelForm):
         fields = ['title', 'body', 'publish']
 
 
-class DocumentUploadForm(forms.ModelForm):
+class DocumentUploadForm(ChunkedUploadFormMixin, forms.ModelForm):
+    chunked_file_fields = ('file',)
+
     class Meta:
         model = Document
         fields = ['title', 'file']
@@ -46,7 +105,9 @@ class CourseForm(forms.ModelForm):
         fields = ['title', 'description', 'outline', 'schedule']
 
 
-class AssignmentForm(forms.ModelForm):
+class AssignmentForm(ChunkedUploadFormMixin, forms.ModelForm):
+    chunked_file_fields = ('attachment',)
+
     class Meta:
         model = Assignment
         fields = ['title', 'description', 'due_date', 'attachment']
@@ -70,32 +131,21 @@ class StaffNoteForm(forms.ModelForm):
         fields = ['title', 'body']
 
 
-class CourseForm(forms.ModelForm):
-    class Meta:
-        model = None
-        # imported dynamically below
-
-
-class AssignmentForm(forms.ModelForm):
-    class Meta:
-        model = None
-        # filled in below
-
-
-class GradeForm(forms.ModelForm):
-    class Meta:
-        model = None
-        # filled in below
+class GradeEntryForm(forms.Form):
+    """One row of the per-assignment grading workbench."""
+    submission_id = forms.IntegerField(widget=forms.HiddenInput)
+    value = forms.CharField(max_length=20, required=False)
+    feedback = forms.CharField(required=False, widget=forms.Textarea(attrs={'rows': 2}))
 
 
-class StaffTaskForm(forms.ModelForm):
-    class Meta:
-        model = None
-        # filled in below
+GradeEntryFormSet = forms.formset_factory(GradeEntryForm, extra=0)
 
 
-class StaffNoteForm(forms.ModelForm):
-    class Meta:
-        model = None
-        # filled in below
+class RosterImportForm(forms.Form):
+    file = forms.FileField(label='CSV file')
 
+    def clean_file(self):
+        f = self.cleaned_data['file']
+        if not f.name.lower().endswith('.csv'):
+            raise forms.ValidationError('Upload a .csv file.')
+        return f
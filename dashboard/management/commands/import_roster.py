@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.roster import import_roster
+
+
+class Command(BaseCommand):
+    help = ('Create students and enrollments in bulk from a CSV with the columns '
+            'username, email, first_name, last_name, password, id_number, department, '
+            'courses (course slugs separated by ";").')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to read.')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per transaction (default ROSTER_BATCH_SIZE).')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processes used to hash passwords (default ROSTER_HASH_WORKERS or the CPU count).')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as f:
+                result = import_roster(f, batch_size=options['batch_size'], hash_workers=options['workers'])
+        except OSError as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for number, problem in result.errors:
+            self.stderr.write(f'Line {number}: {problem}')
+        self.stdout.write(self.style.SUCCESS(result.summary()))
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.models import ChunkedUpload
+from dashboard.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked uploads (and their part files) that have not been touched recently.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24,
+                            help='Remove uploads idle for longer than this many hours (default 24).')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = ChunkedUpload.objects.filter(updated_at__lt=cutoff)
+        removed = 0
+        for upload in stale.iterator():
+            discard_upload(upload)
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} stale upload(s).'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import Enrollment
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalised progress counters on every Enrollment.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', help='Only rebuild enrollments in the course with this slug.')
+
+    def handle(self, *args, **options):
+        enrollments = Enrollment.objects.all()
+        if options['course']:
+            enrollments = enrollments.filter(course__slug=options['course'])
+        updated = enrollments.refresh_progress()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt progress for {updated} enrollment(s).'))
@@ -0,0 +1,58 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from dashboard.models import ActivityLog, ActivityRollup
+
+
+class Command(BaseCommand):
+    help = ('Fold ActivityLog rows older than the retention window into daily '
+            'per-action counts and delete them, one day per transaction.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            default=getattr(settings, 'ACTIVITY_LOG_RETENTION_DAYS', 90),
+                            help='Keep raw rows for this many days (default ACTIVITY_LOG_RETENTION_DAYS).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be rolled up without changing anything.')
+
+    def handle(self, *args, **options):
+        tz = timezone.get_current_timezone()
+        today = timezone.localdate()
+        cutoff = datetime.combine(today - timedelta(days=options['days']), time.min, tzinfo=tz)
+        oldest = ActivityLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp').first()
+        if oldest is None:
+            self.stdout.write('Nothing to roll up.')
+            return
+
+        # Walk whole days so each transaction (and SQLite write lock) covers
+        # one bounded slice of the table.
+        day = timezone.localtime(oldest.timestamp, tz).date()
+        days = removed = 0
+        while True:
+            start = datetime.combine(day, time.min, tzinfo=tz)
+            if start >= cutoff:
+                break
+            end = start + timedelta(days=1)
+            rows = ActivityLog.objects.filter(timestamp__gte=start, timestamp__lt=end)
+            counts = list(rows.values('action').annotate(n=Count('id')).order_by())
+            if counts:
+                days += 1
+                removed += sum(c['n'] for c in counts)
+                if not options['dry_run']:
+                    with transaction.atomic():
+                        for c in counts:
+                            updated = ActivityRollup.objects.filter(day=day, action=c['action']).update(
+                                count=F('count') + c['n'],
+                            )
+                            if not updated:
+                                ActivityRollup.objects.create(day=day, action=c['action'], count=c['n'])
+                        rows.delete()
+            day += timedelta(days=1)
+
+        verb = 'Would roll up' if options['dry_run'] else 'Rolled up'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} row(s) from {days} day(s) before {cutoff.date()}.'))
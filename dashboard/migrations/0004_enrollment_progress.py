@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_progress(apps, schema_editor):
+    Assignment = apps.get_model('dashboard', 'Assignment')
+    Enrollment = apps.get_model('dashboard', 'Enrollment')
+
+    def count(**filters):
+        return Coalesce(Subquery(
+            Assignment.objects.filter(course=OuterRef('course_id'), **filters)
+            .order_by().values('course').annotate(n=Count('id', distinct=True)).values('n')[:1]
+        ), 0)
+
+    Enrollment.objects.update(
+        assignments_total=count(),
+        submitted_count=count(submissions__student=OuterRef('student_id')),
+        graded_count=count(submissions__student=OuterRef('student_id'), submissions__grade__isnull=False),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_support_models_submission_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='assignments_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='graded_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='submitted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:03
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='file',
+            field=models.FileField(storage=core.storage.content_storage, upload_to='documents/'),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.content_storage, upload_to='submissions/'),
+        ),
+    ]
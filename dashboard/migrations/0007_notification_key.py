@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_content_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='key',
+            field=models.CharField(blank=True, max_length=200, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_notification_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'read'], name='dashboard_notif_unread_idx'),
+        ),
+    ]
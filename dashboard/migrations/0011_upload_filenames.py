@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_activity_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -1,8 +1,18 @@
+import uuid
+from pathlib import Path
+
 from django.db import models
 from django.conf import settings
-from django.utils.text import slugify
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from django.urls import reverse
 
+from core.slugs import save_with_unique_slug
+from core.storage import content_storage, uploaded_name
+
 
 class Course(models.Model):
     title = models.CharField(max_length=200)
@@ -19,24 +29,47 @@ class Course(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.title)
-            slug = base
-            counter = 1
-            while Course.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        save = super().save
+        save_with_unique_slug(self, self.title, lambda: save(*args, **kwargs))
 
     def get_absolute_url(self):
         return reverse('dashboard:student_course_detail', kwargs={'slug': self.slug})
 
 
+def _assignment_count(**filters):
+    """Per-enrollment count of the course's assignments matching ``filters``."""
+    return Coalesce(Subquery(
+        Assignment.objects.filter(course=OuterRef('course_id'), **filters)
+        .order_by().values('course').annotate(n=Count('id', distinct=True)).values('n')[:1]
+    ), 0)
+
+
+class EnrollmentQuerySet(models.QuerySet):
+    def refresh_progress(self):
+        """Recompute the progress counters of these enrollments in one UPDATE."""
+        return self.update(
+            assignments_total=_assignment_count(),
+            submitted_count=_assignment_count(submissions__student=OuterRef('student_id')),
+            graded_count=_assignment_count(
+                submissions__student=OuterRef('student_id'),
+                submissions__grade__isnull=False,
+            ),
+        )
+
+
 class Enrollment(models.Model):
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     joined_at = models.DateTimeField(auto_now_add=True)
+    # Denormalised progress, kept current by the signal handlers below and
+    # rebuilt in bulk by `manage.py rebuild_course_progress`.
+    assignments_total = models.PositiveIntegerField(default=0)
+    submitted_count = models.PositiveIntegerField(default=0)
+    graded_count = models.PositiveIntegerField(default=0)
+
+    objects = EnrollmentQuerySet.as_manager()
 
     class Meta:
         unique_together = ('student', 'course')
@@ -44,6 +77,36 @@ class Enrollment(models.Model):
     def __str__(self):
         return f"{self.student} in {self.course}"
 
+    @property
+    def progress(self):
+        """Percentage of the course's assignments the student has submitted."""
+        if not self.assignments_total:
+            return 0
+        return min(int(self.submitted_count * 100 / self.assignments_total), 100)
+
+
+class AssignmentQuerySet(models.QuerySet):
+    def for_student(self, student):
+        """Assignments in the student's enrolled courses with their latest submission.
+
+        Everything comes back in one query: the course is joined and the
+        latest submission and its grade are correlated subqueries, exposed as
+        ``latest_submission_id``, ``latest_submitted_at``, ``latest_grade``
+        and ``latest_feedback``.
+        """
+        latest = Submission.objects.filter(
+            assignment=OuterRef('pk'), student=student,
+        ).order_by('-submitted_at', '-pk')
+        return self.filter(course__enrollment__student=student).select_related('course').annotate(
+            latest_submission_id=Subquery(latest.values('pk')[:1]),
+            latest_submitted_at=Subquery(latest.values('submitted_at')[:1]),
+            latest_grade=Subquery(latest.values('grade__value')[:1]),
+            latest_feedback=Subquery(latest.values('grade__feedback')[:1]),
+        )
+
+    def due_between(self, start, end):
+        return self.filter(due_date__gte=start, due_date__lte=end)
+
 
 class Assignment(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='assignments')
@@ -53,6 +116,8 @@ class Assignment(models.Model):
     attachment = models.FileField(upload_to='assignments/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = AssignmentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
 
@@ -63,12 +128,21 @@ class Assignment(models.Model):
 class Submission(models.Model):
     assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='submissions')
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    file = models.FileField(upload_to='submissions/', null=True, blank=True)
+    file = models.FileField(upload_to='submissions/', null=True, blank=True, storage=content_storage)
+    # The uploaded name; ``file`` is stored under its content hash.
+    filename = models.CharField(max_length=255, blank=True)
     text = models.TextField(blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['submitted_at', 'id'], name='dashboard_submitted_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.filename = uploaded_name(self.file, self.filename)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Submission by {self.student} for {self.assignment}"
@@ -84,6 +158,51 @@ class Grade(models.Model):
         return f"{self.value} for {self.submission}"
 
 
+def _refresh_for_submission(submission):
+    Enrollment.objects.filter(
+        student_id=submission.student_id,
+        course__assignments=submission.assignment_id,
+    ).refresh_progress()
+
+
+@receiver(post_save, sender=Enrollment)
+def init_enrollment_progress(sender, instance, created, **kwargs):
+    if created:
+        Enrollment.objects.filter(pk=instance.pk).refresh_progress()
+
+
+@receiver(post_save, sender=Assignment)
+def count_new_assignment(sender, instance, created, **kwargs):
+    if created:
+        Enrollment.objects.filter(course_id=instance.course_id).update(
+            assignments_total=F('assignments_total') + 1,
+        )
+
+
+@receiver(post_delete, sender=Assignment)
+def uncount_deleted_assignment(sender, instance, **kwargs):
+    # Its submissions and grades were deleted (and re-counted) first.
+    Enrollment.objects.filter(course_id=instance.course_id, assignments_total__gt=0).update(
+        assignments_total=F('assignments_total') - 1,
+    )
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def refresh_progress_for_submission(sender, instance, **kwargs):
+    # Edits never change which assignments count as submitted or graded;
+    # only creations (post_save) and deletions (no `created` kwarg) do.
+    if kwargs.get('created', True):
+        _refresh_for_submission(instance)
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def refresh_progress_for_grade(sender, instance, **kwargs):
+    if kwargs.get('created', True):
+        _refresh_for_submission(instance.submission)
+
+
 class Ticket(models.Model):
     STATUS_CHOICES = [('open', 'Open'), ('in_progress', 'In Progress'), ('closed', 'Closed')]
     title = models.CharField(max_length=200)
@@ -109,13 +228,49 @@ class Announcement(models.Model):
 
 class Document(models.Model):
     title = models.CharField(max_length=200)
-    file = models.FileField(upload_to='documents/')
+    file = models.FileField(upload_to='documents/', storage=content_storage)
+    # The uploaded name; ``file`` is stored under its content hash.
+    filename = models.CharField(max_length=255, blank=True)
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.filename = uploaded_name(self.file, self.filename)
+        super().save(*args, **kwargs)
+
+
+class ChunkedUpload(models.Model):
+    """A file being uploaded in chunks, resumable from ``offset``.
+
+    Bytes are appended to a part file under ``CHUNKED_UPLOAD_DIR`` until
+    ``offset`` reaches ``size``; the completed file is then hashed and can be
+    handed to any FileField through ``ChunkedUploadFormMixin``.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    expected_sha256 = models.CharField(max_length=64, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def path(self):
+        return Path(settings.CHUNKED_UPLOAD_DIR) / f'{self.pk.hex}.part'
+
+    @property
+    def is_complete(self):
+        return self.completed_at is not None
+
 
 class StaffTask(models.Model):
     title = models.CharField(max_length=200)
@@ -141,24 +296,67 @@ class StaffNote(models.Model):
 
 
 class ActivityLog(models.Model):
+    """One user action. Written in batches by dashboard/activity.py."""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     action = models.CharField(max_length=255)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    detail = models.CharField(max_length=255, blank=True)
+    # Set when the action happens, not when the buffered row is written.
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
         return f"{self.timestamp}: {self.user} - {self.action}"
 
 
+class ActivityRollup(models.Model):
+    """Daily per-action counts kept after raw ActivityLog rows are pruned."""
+    day = models.DateField()
+    action = models.CharField(max_length=255)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day', 'action']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'action'], name='dashboard_activity_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.day}: {self.action} x{self.count}"
+
+
 class Notification(models.Model):
     recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
     message = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
+    # Set by background jobs so a retried job doesn't notify twice.
+    key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # The inbox pages in (created_at, id) order: this one walks all of
+            # a user's notifications, the next the unread ones and the badge
+            # count, both without a sort.
+            models.Index(fields=['recipient', 'created_at', 'id'], name='dashboard_notif_all_idx'),
+            models.Index(fields=['recipient', 'read', 'created_at', 'id'], name='dashboard_notif_inbox_idx'),
+        ]
 
     def __str__(self):
         return f"Notification to {self.recipient}: {self.message[:40]}"
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def reset_unread_count(sender, instance, **kwargs):
+    from .notifications import invalidate_unread
+    invalidate_unread([instance.recipient_id])
+
+
 # dashboard/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from . import settings_cache
 
 class SiteSetting(models.Model):
     site_name = models.CharField(max_length=100, default="NORSU Santa Catalina - Bayawan Campus")
@@ -188,4 +386,12 @@ class SiteSetting(models.Model):
             existing.twitter_url = self.twitter_url
             existing.instagram_url = self.instagram_url
             return existing.save(*args, **kwargs)
-        return super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+        # Write through once the row is committed so a rollback can't leave
+        # a value in the cache that never reached the database.
+        transaction.on_commit(lambda: settings_cache.store_site_settings(self))
+
+
+@receiver(post_delete, sender=SiteSetting)
+def invalidate_site_settings(sender, instance, **kwargs):
+    transaction.on_commit(settings_cache.invalidate_site_settings)
\ No newline at end of file
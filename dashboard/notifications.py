@@ -0,0 +1,108 @@
+# dashboard/notifications.py
+"""Notification fan-out used by the background job handlers in tasks.py.
+
+Recipients are read and written in chunks of ``FANOUT_CHUNK_SIZE``: each
+chunk is one keyset query for the users, one ``bulk_create`` of their
+Notification rows and one of their email jobs, committed in its own short
+transaction. A campus-wide announcement therefore never holds the SQLite
+write lock for longer than one chunk, and because every row is keyed per
+recipient a fan-out interrupted half way can simply be run again.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from config.caches import shared_cache
+from jobs.tasks import queue_emails
+
+from .models import Notification
+
+FANOUT_CHUNK_SIZE = 500
+
+
+# Per-user unread counter. The cached value is dropped whenever the user's
+# notifications change (signals in models.py, or explicitly for bulk writes)
+# and recounted on the next page view, so it can never drift. Most
+# notifications are written by ``run_jobs``, whose deletes only reach the web
+# workers through a shared cache; with a per-process one the count is simply
+# taken on every page (one COUNT over the inbox index).
+
+def _unread_key(user_id):
+    return f'dashboard:notifications:unread:{user_id}'
+
+
+def unread_count(user):
+    if not shared_cache():
+        return Notification.objects.filter(recipient=user, read=False).count()
+    key = _unread_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient=user, read=False).count()
+        cache.set(key, count, getattr(settings, 'UNREAD_COUNT_CACHE_TIMEOUT', 60 * 60))
+    return count
+
+
+def invalidate_unread(user_ids):
+    """Forget the cached counts of ``user_ids`` once the transaction commits."""
+    keys = [_unread_key(pk) for pk in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def mark_all_read(user):
+    """Mark every unread notification of ``user`` read in one UPDATE."""
+    updated = Notification.objects.filter(recipient=user, read=False).update(read=True)
+    invalidate_unread([user.pk])
+    return updated
+
+
+def _chunks(users, size):
+    """Yield lists of ``(pk, email)``; querysets are walked by primary key."""
+    if not hasattr(users, 'values_list'):
+        users = [(user.pk, user.email) for user in users]
+        for start in range(0, len(users), size):
+            yield users[start:start + size]
+        return
+    rows = users.order_by('pk').values_list('pk', 'email')
+    last_pk = 0
+    while True:
+        chunk = list(rows.filter(pk__gt=last_pk)[:size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def notify(users, message, key, subject=None, body=None, email=True):
+    """Give each of ``users`` a Notification and, if they have one, an email.
+
+    ``key`` identifies the event; rows and email jobs derived from it are
+    unique per recipient, so running this twice for the same event is safe.
+    ``users`` may be a queryset, which is read in chunks. Pass
+    ``email=False`` for in-app notifications only. Returns the number of
+    recipients.
+    """
+    message = message[:255]
+    total = 0
+    for chunk in _chunks(users, FANOUT_CHUNK_SIZE):
+        notifications = [
+            Notification(recipient_id=pk, message=message, key=f'{key}:{pk}')
+            for pk, _ in chunk
+        ]
+        emails = [
+            (address, subject or message, body or message, f'{key}:email:{pk}')
+            for pk, address in chunk if email and address
+        ]
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+            queue_emails(emails)
+            # bulk_create skips the signals that reset the badge counters.
+            invalidate_unread([pk for pk, _ in chunk])
+        total += len(chunk)
+    return total
+
+
+def staff_users():
+    User = get_user_model()
+    return User.objects.filter(is_active=True, is_staff=True)
@@ -0,0 +1,269 @@
+# dashboard/roster.py
+"""Bulk student/enrollment import and export as CSV.
+
+Columns are ``username, email, first_name, last_name, password, id_number,
+department, courses``. ``courses`` holds course slugs separated by ``;``.
+``password`` may be blank, which leaves the account without a usable password
+until staff reset it. The export writes the same columns without the password,
+so its output can be fed back in.
+
+The import reads the file as a stream and works in batches of
+``ROSTER_BATCH_SIZE`` rows. Each batch is one transaction:
+
+* a few lookups: existing users, profiles, courses and enrollments;
+* one ``bulk_create`` each for users, profiles and enrollments, with
+  ``ignore_conflicts`` so a re-run or an overlapping upload is harmless;
+* one UPDATE to refresh the progress counters of the new enrollments.
+
+``bulk_create`` sends no ``post_save``, so the per-row profile signals in
+accounts/models.py never fire. Existing accounts are not modified; their rows
+only add enrollments. Password hashing is deliberately slow, so a large intake
+hashes in a process pool.
+"""
+import csv
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Prefetch
+
+from accounts.models import UserProfile
+from core.subscriptions import Echo
+
+from .models import Course, Enrollment
+
+COLUMNS = ['username', 'email', 'first_name', 'last_name', 'password', 'id_number', 'department', 'courses']
+EXPORT_COLUMNS = [c for c in COLUMNS if c != 'password']
+# Below this many passwords a batch is hashed in-process; starting the
+# pool costs more than it saves.
+POOL_THRESHOLD = 16
+
+
+def _batch_size():
+    return getattr(settings, 'ROSTER_BATCH_SIZE', 500)
+
+
+def import_dir():
+    return Path(getattr(settings, 'ROSTER_IMPORT_DIR', settings.BASE_DIR / 'tmp' / 'imports'))
+
+
+def store_upload(uploaded):
+    """Copy an uploaded CSV where the job worker can read it; returns its name."""
+    directory = import_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f'{uuid.uuid4().hex}.csv'
+    with open(directory / name, 'wb') as out:
+        for chunk in uploaded.chunks():
+            out.write(chunk)
+    return name
+
+
+def _hash_workers():
+    return getattr(settings, 'ROSTER_HASH_WORKERS', None) or os.cpu_count() or 1
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    users_created: int = 0
+    users_existing: int = 0
+    enrollments_created: int = 0
+    errors: list = field(default_factory=list)
+
+    def summary(self):
+        text = (f'{self.rows} row(s): {self.users_created} new student(s), '
+                f'{self.users_existing} existing, {self.enrollments_created} new enrollment(s)')
+        if self.errors:
+            text += f', {len(self.errors)} problem(s)'
+        return text + '.'
+
+
+class PasswordHasher:
+    """Hashes passwords, in a process pool once there are enough of them."""
+
+    def __init__(self, workers=None):
+        self.workers = workers or _hash_workers()
+        self._pool = None
+
+    def __call__(self, passwords):
+        if self.workers <= 1 or len([p for p in passwords if p]) < POOL_THRESHOLD:
+            return [make_password(p or None) for p in passwords]
+        if self._pool is None:
+            # spawn, not fork: the caller may be a threaded job worker. The
+            # children find DJANGO_SETTINGS_MODULE in the environment.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=get_context('spawn'), initializer=django.setup,
+            )
+        chunksize = max(len(passwords) // (self.workers * 4), 1)
+        return list(self._pool.map(make_password, [p or None for p in passwords], chunksize=chunksize))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def _max_length(model, name):
+    return model._meta.get_field(name).max_length
+
+
+def parse_rows(lines, result):
+    """Yield cleaned row dicts from CSV ``lines``; bad rows go to ``result.errors``."""
+    User = get_user_model()
+    limits = {
+        'username': _max_length(User, 'username'),
+        'email': _max_length(User, 'email'),
+        'id_number': _max_length(UserProfile, 'id_number'),
+    }
+    reader = csv.DictReader(lines)
+    missing = {'username'} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError('The CSV needs a header row with at least a "username" column.')
+    for number, raw in enumerate(reader, start=2):
+        result.rows += 1
+        row = {c: (raw.get(c) or '').strip() for c in COLUMNS}
+        too_long = [c for c, limit in limits.items() if len(row[c]) > limit]
+        if too_long:
+            # One over-long value would fail the whole batch's INSERT.
+            result.errors.append((number, f'{too_long[0]} is longer than {limits[too_long[0]]} characters'))
+            continue
+        try:
+            if not row['username']:
+                raise ValidationError('missing username')
+            User.username_validator(row['username'])
+        except ValidationError as exc:
+            result.errors.append((number, f"invalid username {row['username']!r}: {exc.messages[0]}"))
+            continue
+        if row['email']:
+            try:
+                validate_email(row['email'])
+            except ValidationError:
+                result.errors.append((number, f"invalid email {row['email']!r}"))
+                continue
+        # Kept with their line number, since repeated usernames get merged.
+        row['courses'] = [(slug.strip(), number) for slug in row['courses'].split(';') if slug.strip()]
+        yield row
+
+
+def _import_batch(rows, hasher, courses, result):
+    User = get_user_model()
+    by_username = {}
+    for row in rows:
+        # A username repeated within the batch only adds enrollments.
+        if row['username'] in by_username:
+            by_username[row['username']]['courses'] += row['courses']
+        else:
+            by_username[row['username']] = row
+
+    existing = set(User.objects.filter(username__in=by_username).values_list('username', flat=True))
+    new_rows = [row for name, row in by_username.items() if name not in existing]
+    hashes = dict(zip([row['username'] for row in new_rows], hasher([row['password'] for row in new_rows])))
+    User.objects.bulk_create([
+        User(
+            username=row['username'], email=row['email'], password=hashes[row['username']],
+            first_name=row['first_name'][:150], last_name=row['last_name'][:150],
+        )
+        for row in new_rows
+    ], ignore_conflicts=True)
+
+    ids = {}
+    stored = User.objects.filter(username__in=by_username).values_list('username', 'id', 'password')
+    for username, pk, password in stored:
+        ids[username] = pk
+        # Every hash is salted, so only rows this batch inserted carry ours;
+        # ignore_conflicts drops those a concurrent import got to first.
+        if hashes.get(username) == password:
+            result.users_created += 1
+        else:
+            result.users_existing += 1
+    with_profile = set(UserProfile.objects.filter(user_id__in=ids.values()).values_list('user_id', flat=True))
+    UserProfile.objects.bulk_create([
+        UserProfile(
+            user_id=ids[row['username']], role='student',
+            id_number=row['id_number'] or None, department=row['department'][:100],
+        )
+        for row in by_username.values()
+        if row['username'] in ids and ids[row['username']] not in with_profile
+    ], ignore_conflicts=True)
+
+    wanted_slugs = {slug for row in by_username.values() for slug, _ in row['courses']} - set(courses)
+    if wanted_slugs:
+        courses.update(Course.objects.filter(slug__in=wanted_slugs).values_list('slug', 'id'))
+    pairs = set()
+    for row in by_username.values():
+        for slug, line in row['courses']:
+            if slug not in courses:
+                result.errors.append((line, f'unknown course {slug!r}'))
+            elif row['username'] in ids:
+                pairs.add((ids[row['username']], courses[slug]))
+    if not pairs:
+        return
+    student_ids = {s for s, _ in pairs}
+    course_ids = {c for _, c in pairs}
+    enrolled = set(
+        Enrollment.objects.filter(student_id__in=student_ids, course_id__in=course_ids)
+        .values_list('student_id', 'course_id')
+    )
+    new_pairs = pairs - enrolled
+    Enrollment.objects.bulk_create(
+        [Enrollment(student_id=s, course_id=c) for s, c in new_pairs], ignore_conflicts=True,
+    )
+    result.enrollments_created += len(new_pairs)
+    if new_pairs:
+        Enrollment.objects.filter(
+            student_id__in={s for s, _ in new_pairs}, course_id__in={c for _, c in new_pairs},
+        ).refresh_progress()
+
+
+def import_roster(lines, batch_size=None, hash_workers=None):
+    """Import students and enrollments from CSV ``lines``; returns an ImportResult."""
+    result = ImportResult()
+    batch_size = batch_size or _batch_size()
+    hasher = PasswordHasher(hash_workers)
+    courses = {}
+    batch = []
+    try:
+        for row in parse_rows(lines, result):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                with transaction.atomic():
+                    _import_batch(batch, hasher, courses, result)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                _import_batch(batch, hasher, courses, result)
+    finally:
+        hasher.close()
+    return result
+
+
+def iter_roster_csv(chunk_size=1000):
+    """Yield every student with their course slugs as CSV lines."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    students = (
+        get_user_model().objects.filter(is_staff=False, is_superuser=False)
+        .select_related('userprofile')
+        .prefetch_related(Prefetch(
+            'enrollment_set', queryset=Enrollment.objects.select_related('course').only('student_id', 'course__slug'),
+        ))
+        .order_by('id')
+    )
+    for user in students.iterator(chunk_size=chunk_size):
+        profile = getattr(user, 'userprofile', None)
+        yield writer.writerow([
+            user.username, user.email, user.first_name, user.last_name,
+            (profile.id_number or '') if profile else '',
+            profile.department if profile else '',
+            ';'.join(sorted(e.course.slug for e in user.enrollment_set.all())),
+        ])
@@ -0,0 +1,101 @@
+# dashboard/settings_cache.py
+"""Two-level cache for the singleton ``SiteSetting`` row.
+
+Every template render goes through ``dashboard.context_processors.site_settings``,
+so the row is kept in a short-lived process-local slot backed by the shared
+Django cache. ``SiteSetting.save()`` writes the fresh row through and deletes
+clear it; other processes pick the change up once their local slot expires.
+
+With a per-process ``CACHES['default']`` the "shared" level is just another
+local copy that the save never reaches in other workers, so it is kept no
+longer than ``SITE_SETTINGS_LOCAL_TTL`` either.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.caches import shared_cache
+
+CACHE_KEY = 'dashboard:site_settings'
+# Stored in the shared cache when no SiteSetting row exists, so an empty
+# table does not cost a query per render either.
+NO_ROW = 'dashboard:site_settings:none'
+
+_lock = threading.Lock()
+_local = {'value': None, 'expires': 0.0}
+_stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+
+def _local_ttl():
+    return getattr(settings, 'SITE_SETTINGS_LOCAL_TTL', 30)
+
+
+def _shared_timeout():
+    if not shared_cache():
+        return _local_ttl()
+    return getattr(settings, 'SITE_SETTINGS_CACHE_TIMEOUT', 60 * 60)
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def _set_local(value):
+    with _lock:
+        _local['value'] = value
+        _local['expires'] = time.monotonic() + _local_ttl()
+
+
+def get_site_settings():
+    """Return the SiteSetting row (or None), querying only on a cold cache."""
+    with _lock:
+        if _local['expires'] > time.monotonic():
+            _stats['local_hits'] += 1
+            return _local['value']
+
+    value = cache.get(CACHE_KEY)
+    if value is None:
+        _count('misses')
+        from .models import SiteSetting
+        value = SiteSetting.objects.first()
+        cache.set(CACHE_KEY, NO_ROW if value is None else value, _shared_timeout())
+    else:
+        _count('shared_hits')
+        if isinstance(value, str) and value == NO_ROW:
+            value = None
+
+    _set_local(value)
+    return value
+
+
+def store_site_settings(instance):
+    """Write a freshly saved row through both cache levels."""
+    cache.set(CACHE_KEY, instance, _shared_timeout())
+    _set_local(instance)
+
+
+def invalidate_site_settings():
+    """Drop both cache levels so the next render reloads from the database."""
+    cache.delete(CACHE_KEY)
+    with _lock:
+        _local['value'] = None
+        _local['expires'] = 0.0
+
+
+def cache_stats():
+    """Snapshot of this process's hit/miss counters.
+
+    ``misses`` is the number of renders that actually queried SiteSetting, so
+    a steady-state page should only move ``local_hits``/``shared_hits``.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,73 @@
+# dashboard/tasks.py
+"""Background handlers for dashboard notifications (see jobs/queue.py)."""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from jobs.queue import task
+
+from .models import Announcement, Grade, Ticket
+from .notifications import notify
+from .roster import import_dir, import_roster
+
+
+def _link(path):
+    return getattr(settings, 'SITE_URL', '').rstrip('/') + path
+
+
+@task('dashboard.ticket_updated')
+def ticket_updated(payload):
+    ticket = Ticket.objects.select_related('created_by').filter(pk=payload['ticket_id']).first()
+    if ticket is None or ticket.created_by is None:
+        return
+    status = dict(Ticket.STATUS_CHOICES).get(payload['status'], payload['status'])
+    message = f'Your ticket "{ticket.title}" is now {status}.'
+    notify([ticket.created_by], message, payload['key'],
+           subject=f'Ticket update: {ticket.title}', body=message)
+
+
+@task('dashboard.grade_posted')
+def grade_posted(payload):
+    grade = (
+        Grade.objects.select_related('submission__student', 'submission__assignment__course')
+        .filter(pk=payload['grade_id']).first()
+    )
+    if grade is None:
+        return
+    assignment = grade.submission.assignment
+    message = f'You received {grade.value} on "{assignment.title}" ({assignment.course.title}).'
+    body = message
+    if grade.feedback:
+        body += f'\n\nFeedback:\n{grade.feedback}'
+    body += f"\n\n{_link(reverse('dashboard:student_grades'))}"
+    notify([grade.submission.student], message, payload['key'],
+           subject=f'New grade: {assignment.title}', body=body)
+
+
+@task('dashboard.announcement_published', atomic=False)
+def announcement_published(payload):
+    """Fan an announcement out to every active user, one chunk per transaction."""
+    announcement = Announcement.objects.filter(pk=payload['announcement_id'], publish=True).first()
+    if announcement is None:
+        return
+    recipients = get_user_model().objects.filter(is_active=True)
+    notify(recipients, f'Announcement: {announcement.title}', payload['key'],
+           subject=announcement.title, body=announcement.body)
+
+
+@task('dashboard.import_roster', atomic=False, max_attempts=3)
+def import_roster_upload(payload):
+    """Run a roster CSV uploaded on the staff page; batches commit as they go."""
+    path = import_dir() / payload['name']
+    if not path.exists():
+        # Already imported by an earlier attempt that died before finishing.
+        return
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        try:
+            result = import_roster(f)
+            message = f"Roster import of {payload['filename']}: {result.summary()}"
+        except ValueError as exc:
+            message = f"Roster import of {payload['filename']} failed: {exc}"
+    path.unlink()
+    staff = get_user_model().objects.filter(pk=payload['user_id'])
+    notify(staff, message, f"roster-import:{payload['name']}", email=False)
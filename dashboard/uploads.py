@@ -0,0 +1,128 @@
+# dashboard/uploads.py
+"""Server side of the chunked, resumable upload API.
+
+Chunks are streamed from the request straight into the part file at the
+session's current offset, so neither a chunk nor the whole file is ever
+held in memory. If a transfer drops mid-chunk, the bytes that did arrive
+still count and the client resumes from the offset reported by the server.
+"""
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .models import ChunkedUpload
+
+COPY_BLOCK_SIZE = 64 * 1024
+SHA256_RE = re.compile(r'[0-9a-f]{64}')
+
+
+class UploadError(ValueError):
+    pass
+
+
+class OffsetMismatch(UploadError):
+    """The client is writing somewhere other than the session's offset."""
+
+
+class ChecksumMismatch(UploadError):
+    """The finished file didn't match ``expected_sha256``; it has been discarded."""
+
+
+def max_upload_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+
+
+def max_chunk_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+
+
+def chunk_size():
+    """Chunk size suggested to clients; must not exceed ``max_chunk_size()``."""
+    return min(getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', 1024 * 1024), max_chunk_size())
+
+
+def start_upload(owner, filename, size, expected_sha256=''):
+    if size <= 0 or size > max_upload_size():
+        raise UploadError(f'File size must be between 1 byte and {max_upload_size()} bytes.')
+    expected_sha256 = expected_sha256.strip().lower()
+    if expected_sha256 and not SHA256_RE.fullmatch(expected_sha256):
+        raise UploadError('sha256 must be 64 hexadecimal characters.')
+    upload = ChunkedUpload.objects.create(
+        owner=owner,
+        filename=os.path.basename(filename)[:255] or 'upload',
+        size=size,
+        expected_sha256=expected_sha256,
+    )
+    upload.path.parent.mkdir(parents=True, exist_ok=True)
+    upload.path.touch()
+    return upload
+
+
+def append_chunk(upload, stream, offset, length):
+    """Write ``length`` bytes from ``stream`` at ``offset``; return the new offset."""
+    if upload.is_complete:
+        raise UploadError('Upload is already complete.')
+    if offset != upload.offset:
+        raise OffsetMismatch(f'Expected offset {upload.offset}.')
+    if length <= 0 or length > max_chunk_size() or offset + length > upload.size:
+        raise UploadError('Chunk length is out of range.')
+
+    written = 0
+    try:
+        with open(upload.path, 'r+b') as part:
+            part.seek(offset)
+            while written < length:
+                block = stream.read(min(COPY_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                part.write(block)
+                written += len(block)
+    finally:
+        # Record whatever arrived so an interrupted chunk resumes mid-way.
+        if written:
+            advanced = ChunkedUpload.objects.filter(pk=upload.pk, offset=offset).update(
+                offset=offset + written, updated_at=timezone.now(),
+            )
+            if advanced:
+                upload.offset = offset + written
+            else:
+                # A concurrent retry of the same chunk got there first.
+                upload.refresh_from_db(fields=['offset'])
+
+    if upload.offset == upload.size:
+        finish_upload(upload)
+    return upload.offset
+
+
+def finish_upload(upload):
+    digest = hashlib.sha256()
+    with open(upload.path, 'r+b') as part:
+        # Drop any tail left behind by an interrupted chunk that was retried.
+        part.truncate(upload.size)
+        for block in iter(lambda: part.read(COPY_BLOCK_SIZE), b''):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+    if upload.expected_sha256 and upload.expected_sha256 != sha256:
+        discard_upload(upload)
+        raise ChecksumMismatch('Checksum mismatch; the upload has been discarded.')
+    upload.sha256 = sha256
+    upload.completed_at = timezone.now()
+    upload.save(update_fields=['sha256', 'completed_at', 'updated_at'])
+
+
+def open_upload(upload):
+    """The reassembled file as a Django File, ready for ``FileField`` assignment."""
+    return File(open(upload.path, 'rb'), name=upload.filename)
+
+
+def discard_upload(upload):
+    try:
+        os.remove(upload.path)
+    except FileNotFoundError:
+        pass
+    if upload.pk:
+        upload.delete()
@@ -6,6 +6,9 @@ app_name = 'dashboard'
 
 urlpatterns = [
     path('', views.dashboard_index, name='index'),
+    path('notifications/', views.notifications_inbox, name='notifications'),
+    path('notifications/read-all/', views.notifications_mark_all_read, name='notifications_mark_all_read'),
+    path('notifications/<int:pk>/read/', views.notification_mark_read, name='notification_mark_read'),
     # Student area
     path('student/', views.student_dashboard, name='student_index'),
     path('student/courses/', views.student_courses, name='student_courses'),
@@ -23,6 +26,8 @@ urlpatterns = [
     path('staff/support/', views.staff_support_tools, name='staff_support_tools'),
     # Staff student management actions
     path('staff/students/list/', views.staff_students_list, name='staff_students_list'),
+    path('staff/students/import/', views.staff_roster_import, name='staff_roster_import'),
+    path('staff/students/export.csv', views.staff_roster_export, name='staff_roster_export'),
     path('staff/students/<int:user_id>/edit/', views.staff_edit_student, name='staff_edit_student'),
     path('staff/students/<int:user_id>/reset-password/', views.staff_reset_password, name='staff_reset_password'),
     path('staff/students/<int:user_id>/enroll/<slug:slug>/', views.staff_enroll_student, name='staff_enroll_student'),
@@ -34,6 +39,7 @@ urlpatterns = [
     path('staff/support/tickets/<int:pk>/', views.ticket_detail, name='ticket_detail'),
     path('staff/support/announcements/', views.announcements_list, name='announcements_list'),
     path('staff/support/announcements/new/', views.announcement_create, name='announcement_create'),
+    path('staff/support/subscriptions.csv', views.subscriptions_export, name='subscriptions_export'),
     path('staff/support/documents/', views.documents_list, name='documents_list'),
     path('staff/support/documents/upload/', views.document_upload, name='document_upload'),
 
@@ -51,6 +57,11 @@ urlpatterns = [
     # Faculty grading actions
     path('faculty/grade-submissions/list/', views.faculty_grade_submissions_list, name='faculty_grade_submissions_list'),
     path('faculty/grade-submissions/<int:submission_id>/grade/', views.faculty_grade_submission, name='faculty_grade_submission'),
+    path('faculty/assignments/<int:pk>/grade/', views.faculty_grade_assignment, name='faculty_grade_assignment'),
+
+    # Chunked, resumable uploads used by the submission, document and material forms
+    path('uploads/', views.upload_start, name='upload_start'),
+    path('uploads/<uuid:upload_id>/', views.upload_chunk, name='upload_chunk'),
 
     # Faculty staff coordination
     path('faculty/staff-tasks/', views.faculty_staff_tasks, name='faculty_staff_tasks'),
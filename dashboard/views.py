@@ -5,30 +5,47 @@ from django.shortcuts import get_object_or_404
 from django.contrib import messages
 from .models import (
     Course, Enrollment, Assignment, Submission, Grade,
-    Ticket, Announcement, Document, StaffTask, StaffNote,
+    Ticket, Announcement, Document, StaffTask, StaffNote, ChunkedUpload,
+    Notification,
 )
 from .forms import (
     SubmissionForm, StudentEditForm, TicketForm, AnnouncementForm, DocumentUploadForm,
     CourseForm, AssignmentForm, GradeForm, StaffTaskForm, StaffNoteForm,
+    GradeEntryFormSet, RosterImportForm,
 )
 from django.contrib.auth import get_user_model
 from django.views.decorators.http import require_http_methods
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
+from datetime import timedelta
+import hashlib
+from django.http import JsonResponse, StreamingHttpResponse
+from accounts.roles import STAFF_ROLES, staff_required, user_role
+from core.pagination import keyset_page
+from core.subscriptions import iter_csv
+from jobs.queue import enqueue, enqueue_many
+from . import notifications, roster, uploads
+from .activity import log_activity
 
 User = get_user_model()
 
+SUBMISSIONS_PER_PAGE = 25
+NOTIFICATIONS_PER_PAGE = 20
+MAX_DUE_WINDOW_DAYS = 365
+
 # Faculty: course builder and grading
 @login_required
+@staff_required
 def faculty_courses_list(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     courses = Course.objects.all().order_by('title')
     return render(request, 'dashboard/faculty/courses_list.html', {'courses': courses})
 
 
 @login_required
+@staff_required
 def faculty_course_create(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     if request.method == 'POST':
         form = CourseForm(request.POST)
         if form.is_valid():
@@ -41,9 +58,8 @@ def faculty_course_create(request):
 
 
 @login_required
+@staff_required
 def faculty_course_edit(request, slug):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     course = get_object_or_404(Course, slug=slug)
     if request.method == 'POST':
         form = CourseForm(request.POST, instance=course)
@@ -57,36 +73,94 @@ def faculty_course_edit(request, slug):
 
 
 @login_required
+@staff_required
 def faculty_course_materials(request, slug):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     course = get_object_or_404(Course, slug=slug)
     assignments = course.assignments.all()
     if request.method == 'POST':
-        form = AssignmentForm(request.POST, request.FILES)
-        if form.is_valid():
-            assignment = form.save(commit=False)
-            assignment.course = course
-            assignment.save()
-            messages.success(request, 'Material/assignment uploaded.')
-            return redirect('dashboard:faculty_course_materials', slug=slug)
+        form = AssignmentForm(request.POST, request.FILES, uploader=request.user)
+        try:
+            if form.is_valid():
+                assignment = form.save(commit=False)
+                assignment.course = course
+                assignment.save()
+                form.release_uploads()
+                messages.success(request, 'Material/assignment uploaded.')
+                return redirect('dashboard:faculty_course_materials', slug=slug)
+        finally:
+            form.close_uploads()
     else:
         form = AssignmentForm()
     return render(request, 'dashboard/faculty/course_materials.html', {'course': course, 'assignments': assignments, 'form': form})
 
 
 @login_required
+@staff_required
 def faculty_grade_submissions_list(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
-    submissions = Submission.objects.select_related('assignment', 'student').order_by('-submitted_at')
-    return render(request, 'dashboard/faculty/grade_submissions_list.html', {'submissions': submissions})
+    """Submissions, newest first, filtered by course/assignment/graded state.
+
+    Pages are keyset-paginated on ``(submitted_at, id)`` and every relation
+    the template touches is joined in, so each page is a fixed handful of
+    queries however many submissions exist.
+    """
+    submissions = Submission.objects.select_related('assignment__course', 'student', 'grade')
+
+    course_slug = request.GET.get('course', '')
+    assignment_id = request.GET.get('assignment', '')
+    state = request.GET.get('state', '')
+    if course_slug:
+        submissions = submissions.filter(assignment__course__slug=course_slug)
+    if assignment_id.isdigit():
+        submissions = submissions.filter(assignment_id=assignment_id)
+    if state == 'graded':
+        submissions = submissions.filter(grade__isnull=False)
+    elif state == 'ungraded':
+        submissions = submissions.filter(grade__isnull=True)
+
+    try:
+        page = keyset_page(
+            submissions, SUBMISSIONS_PER_PAGE, 'submitted_at',
+            after=request.GET.get('after'), before=request.GET.get('before'),
+        )
+    except ValueError:
+        page = keyset_page(submissions, SUBMISSIONS_PER_PAGE, 'submitted_at')
+
+    assignments = Assignment.objects.none()
+    if course_slug:
+        assignments = Assignment.objects.filter(course__slug=course_slug).only('id', 'title')
+    filters = request.GET.copy()
+    for key in ('after', 'before'):
+        filters.pop(key, None)
+    return render(request, 'dashboard/faculty/grade_submissions_list.html', {
+        'submissions': page,
+        'page_obj': page,
+        'courses': Course.objects.only('slug', 'title'),
+        'assignments': assignments,
+        'selected_course': course_slug,
+        'selected_assignment': assignment_id,
+        'selected_state': state,
+        'filter_query': filters.urlencode(),
+    })
+
+
+def _queue_grade_notifications(grades):
+    """Queue a "new grade" notification per grade, keyed on its content.
+
+    Like ticket updates, the same content within the same minute is a double
+    submit; changing a grade back later notifies again.
+    """
+    items = []
+    minute = f'{timezone.now():%Y%m%d%H%M}'
+    for grade in grades:
+        digest = hashlib.sha1(f'{grade.value}\0{grade.feedback}'.encode('utf-8')).hexdigest()[:12]
+        key = f'grade:{grade.pk}:{digest}:{minute}'
+        items.append(({'grade_id': grade.pk, 'key': key}, key))
+    enqueue_many('dashboard.grade_posted', items)
 
 
 @login_required
+@staff_required
 def faculty_grade_submission(request, submission_id):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     submission = get_object_or_404(Submission, pk=submission_id)
     try:
         grade = submission.grade
@@ -97,7 +171,11 @@ def faculty_grade_submission(request, submission_id):
         if form.is_valid():
             g = form.save(commit=False)
             g.submission = submission
-            g.save()
+            with transaction.atomic():
+                g.save()
+                if form.has_changed() or grade is None:
+                    _queue_grade_notifications([g])
+            log_activity(request.user, 'grade.save', f'submission {submission.pk}')
             messages.success(request, 'Grade saved.')
             return redirect('dashboard:faculty_grade_submissions_list')
     else:
@@ -106,9 +184,77 @@ def faculty_grade_submission(request, submission_id):
 
 
 @login_required
+@staff_required
+def faculty_grade_assignment(request, pk):
+    """Grade every submission for one assignment in a single form.
+
+    Submissions, students and existing grades load in one joined query, and
+    changed rows are written with one bulk_create and one bulk_update.
+    """
+    assignment = get_object_or_404(Assignment.objects.select_related('course'), pk=pk)
+    submissions = list(
+        assignment.submissions.select_related('student', 'grade')
+        .order_by('student__last_name', 'student__first_name', 'student__username', '-submitted_at')
+    )
+    by_id = {s.pk: s for s in submissions}
+
+    if request.method == 'POST':
+        formset = GradeEntryFormSet(request.POST)
+        if formset.is_valid():
+            to_create, to_update = [], []
+            for form in formset:
+                if not form.has_changed():
+                    continue
+                submission = by_id.get(form.cleaned_data['submission_id'])
+                value = form.cleaned_data['value'].strip()
+                feedback = form.cleaned_data['feedback']
+                if submission is None or not value:
+                    continue
+                grade = getattr(submission, 'grade', None)
+                if grade is None:
+                    to_create.append(Grade(submission=submission, value=value, feedback=feedback))
+                elif (grade.value, grade.feedback) != (value, feedback):
+                    grade.value, grade.feedback = value, feedback
+                    to_update.append(grade)
+            with transaction.atomic():
+                Grade.objects.bulk_create(to_create)
+                Grade.objects.bulk_update(to_update, ['value', 'feedback'])
+                _queue_grade_notifications(to_create + to_update)
+                # bulk_create skips the Grade signals that keep progress current.
+                if to_create:
+                    Enrollment.objects.filter(
+                        course_id=assignment.course_id,
+                        student_id__in={g.submission.student_id for g in to_create},
+                    ).refresh_progress()
+            log_activity(request.user, 'grade.bulk_save', f'assignment {pk}: {len(to_create) + len(to_update)}')
+            messages.success(request, f'{len(to_create) + len(to_update)} grade(s) saved.')
+            return redirect('dashboard:faculty_grade_assignment', pk=pk)
+    else:
+        formset = GradeEntryFormSet(initial=[
+            {
+                'submission_id': s.pk,
+                'value': s.grade.value if hasattr(s, 'grade') else '',
+                'feedback': s.grade.feedback if hasattr(s, 'grade') else '',
+            }
+            for s in submissions
+        ])
+
+    rows = []
+    for form in formset:
+        try:
+            rows.append((form, by_id[int(form['submission_id'].value())]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return render(request, 'dashboard/faculty/grade_assignment.html', {
+        'assignment': assignment,
+        'formset': formset,
+        'rows': rows,
+    })
+
+
+@login_required
+@staff_required
 def faculty_staff_tasks(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     tasks = StaffTask.objects.all().order_by('-created_at')
     if request.method == 'POST':
         form = StaffTaskForm(request.POST)
@@ -124,9 +270,8 @@ def faculty_staff_tasks(request):
 
 
 @login_required
+@staff_required
 def faculty_staff_notes(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     notes = StaffNote.objects.all().order_by('-created_at')
     if request.method == 'POST':
         form = StaffNoteForm(request.POST)
@@ -143,7 +288,7 @@ def faculty_staff_notes(request):
 @login_required
 def dashboard_index(request):
     # Route non-staff to the student dashboard
-    if not request.user.is_staff and not request.user.is_superuser:
+    if user_role(request) not in STAFF_ROLES:
         return redirect('dashboard:student_index')
 
     # Simple dashboard context for now
@@ -173,27 +318,26 @@ def student_dashboard(request):
 @login_required
 def student_courses(request):
     # Show courses the student is enrolled in and available courses
-    enrolled = Course.objects.filter(enrollment__student=request.user)
-    available = Course.objects.exclude(enrollment__student=request.user)
+    enrollments = Enrollment.objects.filter(student=request.user).select_related('course').order_by('course__title')
+    enrolled = []
+    for enrollment in enrollments:
+        enrollment.course.progress = enrollment.progress
+        enrolled.append(enrollment.course)
+    available = Course.objects.exclude(pk__in=[c.pk for c in enrolled])
     return render(request, 'dashboard/student/courses.html', {'enrolled': enrolled, 'available': available})
 
 
 @login_required
 def student_course_detail(request, slug):
     course = get_object_or_404(Course, slug=slug)
-    is_enrolled = Enrollment.objects.filter(course=course, student=request.user).exists()
+    enrollment = Enrollment.objects.filter(course=course, student=request.user).first()
     assignments = course.assignments.all()
 
-    # simple progress: number of submissions / number of assignments
-    total = assignments.count()
-    submitted = Submission.objects.filter(assignment__in=assignments, student=request.user).count()
-    progress = int((submitted / total) * 100) if total > 0 else 0
-
     return render(request, 'dashboard/student/course_detail.html', {
         'course': course,
-        'is_enrolled': is_enrolled,
+        'is_enrolled': enrollment is not None,
         'assignments': assignments,
-        'progress': progress,
+        'progress': enrollment.progress if enrollment else 0,
     })
 
 
@@ -201,6 +345,7 @@ def student_course_detail(request, slug):
 def student_join_course(request, slug):
     course = get_object_or_404(Course, slug=slug)
     Enrollment.objects.get_or_create(student=request.user, course=course)
+    log_activity(request.user, 'enrollment.join', course.slug)
     messages.success(request, f'You have joined {course.title}.')
     return redirect(course.get_absolute_url())
 
@@ -209,6 +354,7 @@ def student_join_course(request, slug):
 def student_leave_course(request, slug):
     course = get_object_or_404(Course, slug=slug)
     Enrollment.objects.filter(student=request.user, course=course).delete()
+    log_activity(request.user, 'enrollment.leave', course.slug)
     messages.success(request, f'You have left {course.title}.')
     return redirect('dashboard:student_courses')
 
@@ -224,60 +370,80 @@ def assignment_detail(request, pk):
 def submit_assignment(request, pk):
     assignment = get_object_or_404(Assignment, pk=pk)
     if request.method == 'POST':
-        form = SubmissionForm(request.POST, request.FILES)
-        if form.is_valid():
-            submission = form.save(commit=False)
-            submission.assignment = assignment
-            submission.student = request.user
-            submission.save()
-            messages.success(request, 'Assignment submitted successfully.')
-            return redirect('dashboard:student_assignments')
+        form = SubmissionForm(request.POST, request.FILES, uploader=request.user)
+        try:
+            if form.is_valid():
+                submission = form.save(commit=False)
+                submission.assignment = assignment
+                submission.student = request.user
+                submission.save()
+                form.release_uploads()
+                log_activity(request.user, 'submission.create', f'assignment {assignment.pk}')
+                messages.success(request, 'Assignment submitted successfully.')
+                return redirect('dashboard:student_assignments')
+        finally:
+            form.close_uploads()
     else:
         form = SubmissionForm()
     return render(request, 'dashboard/student/submit_assignment.html', {'form': form, 'assignment': assignment})
 
 
+def _due_window(request):
+    """Days ahead from ``?due=N`` (e.g. 14 for the dashboard), or None."""
+    days = request.GET.get('due', '')
+    if days.isdigit() and 0 < int(days) <= MAX_DUE_WINDOW_DAYS:
+        return int(days)
+    return None
+
+
 @login_required
 def student_assignments(request):
-    assignments = []
-    return render(request, 'dashboard/student/assignments.html', {'assignments': assignments})
+    assignments = Assignment.objects.for_student(request.user)
+    due_within = _due_window(request)
+    if due_within:
+        now = timezone.now()
+        assignments = assignments.due_between(now, now + timedelta(days=due_within))
+    assignments = assignments.order_by(F('due_date').asc(nulls_last=True), '-created_at')
+    return render(request, 'dashboard/student/assignments.html', {
+        'assignments': assignments,
+        'due_within': due_within,
+    })
 
 
 @login_required
 def student_grades(request):
-    grades = []
+    grades = (
+        Grade.objects.filter(submission__student=request.user)
+        .select_related('submission__assignment__course')
+        .order_by('-graded_at')
+    )
     return render(request, 'dashboard/student/grades.html', {'grades': grades})
 
 
 @login_required
+@staff_required
 def staff_dashboard(request):
-    # Only allow staff or superusers
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     context = {}
     return render(request, 'dashboard/staff/index.html', context)
 
 
 @login_required
+@staff_required
 def staff_student_management(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     students = []
     return render(request, 'dashboard/staff/student_management.html', {'students': students})
 
 
 @login_required
+@staff_required
 def staff_students_list(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     students = User.objects.filter(is_staff=False).order_by('last_name', 'first_name')
     return render(request, 'dashboard/staff/students_list.html', {'students': students})
 
 
 @login_required
+@staff_required
 def staff_edit_student(request, user_id):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     student = get_object_or_404(User, pk=user_id)
     if request.method == 'POST':
         form = StudentEditForm(request.POST, instance=student)
@@ -292,73 +458,106 @@ def staff_edit_student(request, user_id):
 
 @login_required
 @require_http_methods(['POST'])
+@staff_required
 def staff_reset_password(request, user_id):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     student = get_object_or_404(User, pk=user_id)
     temp = User.objects.make_random_password()
     student.set_password(temp)
     student.save()
+    log_activity(request.user, 'password.reset', student.username)
     messages.success(request, f"Password reset. Temporary password: {temp}")
     return redirect('dashboard:staff_edit_student', user_id=user_id)
 
 
 @login_required
+@staff_required
 def staff_enroll_student(request, user_id, slug):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     student = get_object_or_404(User, pk=user_id)
     course = get_object_or_404(Course, slug=slug)
     Enrollment.objects.get_or_create(student=student, course=course)
+    log_activity(request.user, 'enrollment.staff_enroll', f'{student.username} {course.slug}')
     messages.success(request, f"{student.get_full_name() or student.username} enrolled in {course.title}.")
     return redirect('dashboard:staff_students_list')
 
 
 @login_required
+@staff_required
 def staff_unenroll_student(request, user_id, slug):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     student = get_object_or_404(User, pk=user_id)
     course = get_object_or_404(Course, slug=slug)
     Enrollment.objects.filter(student=student, course=course).delete()
+    log_activity(request.user, 'enrollment.staff_unenroll', f'{student.username} {course.slug}')
     messages.success(request, f"{student.get_full_name() or student.username} unenrolled from {course.title}.")
     return redirect('dashboard:staff_students_list')
 
 
 @login_required
+@staff_required
+def staff_roster_import(request):
+    """Upload a student/enrollment CSV; the job worker imports it in batches."""
+    if request.method == 'POST':
+        form = RosterImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            uploaded = form.cleaned_data['file']
+            name = roster.store_upload(uploaded)
+            with transaction.atomic():
+                enqueue('dashboard.import_roster', {
+                    'name': name, 'filename': uploaded.name, 'user_id': request.user.pk,
+                }, key=f'roster-import:{name}')
+            log_activity(request.user, 'roster.import', uploaded.name)
+            messages.success(request, 'Import queued. You will get a notification when it has finished.')
+            return redirect('dashboard:staff_students_list')
+    else:
+        form = RosterImportForm()
+    return render(request, 'dashboard/staff/roster_import.html', {'form': form, 'columns': roster.COLUMNS})
+
+
+@login_required
+@staff_required
+def staff_roster_export(request):
+    """Stream every student and their course slugs as CSV."""
+    response = StreamingHttpResponse(roster.iter_roster_csv(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="students.csv"'
+    return response
+
+
+@login_required
+@staff_required
 def staff_view_performance(request, user_id):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     student = get_object_or_404(User, pk=user_id)
     submissions = Submission.objects.filter(student=student).select_related('assignment')
     return render(request, 'dashboard/staff/student_performance.html', {'student': student, 'submissions': submissions})
 
 
 @login_required
+@staff_required
 def staff_support_tools(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     tools = []
     return render(request, 'dashboard/staff/support_tools.html', {'tools': tools})
 
 
 @login_required
+@staff_required
 def tickets_list(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     tickets = Ticket.objects.all().order_by('-created_at')
     return render(request, 'dashboard/staff/tickets_list.html', {'tickets': tickets})
 
 
 @login_required
+@staff_required
 def ticket_detail(request, pk):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     ticket = get_object_or_404(Ticket, pk=pk)
     if request.method == 'POST':
         form = TicketForm(request.POST, instance=ticket)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                if 'status' in form.changed_data:
+                    # Same status within the same minute is a double submit.
+                    key = f"ticket:{ticket.pk}:{ticket.status}:{timezone.now():%Y%m%d%H%M}"
+                    enqueue('dashboard.ticket_updated', {
+                        'ticket_id': ticket.pk, 'status': ticket.status, 'key': key,
+                    }, key=key)
             messages.success(request, 'Ticket updated.')
             return redirect('dashboard:ticket_detail', pk=pk)
     else:
@@ -367,23 +566,26 @@ def ticket_detail(request, pk):
 
 
 @login_required
+@staff_required
 def announcements_list(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     items = Announcement.objects.all().order_by('-created_at')
     return render(request, 'dashboard/staff/announcements_list.html', {'items': items})
 
 
 @login_required
+@staff_required
 def announcement_create(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     if request.method == 'POST':
         form = AnnouncementForm(request.POST)
         if form.is_valid():
             ann = form.save(commit=False)
             ann.created_by = request.user
-            ann.save()
+            with transaction.atomic():
+                ann.save()
+                if ann.publish:
+                    enqueue('dashboard.announcement_published', {
+                        'announcement_id': ann.pk, 'key': f'announcement:{ann.pk}',
+                    }, key=f'announcement:{ann.pk}')
             messages.success(request, 'Announcement published.')
             return redirect('dashboard:announcements_list')
     else:
@@ -392,53 +594,157 @@ def announcement_create(request):
 
 
 @login_required
+@staff_required
+def subscriptions_export(request):
+    """Stream the newsletter subscriber list as CSV for mailing."""
+    response = StreamingHttpResponse(iter_csv(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="subscriptions.csv"'
+    return response
+
+
+@login_required
+@staff_required
 def documents_list(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     docs = Document.objects.all().order_by('-uploaded_at')
     return render(request, 'dashboard/staff/documents_list.html', {'docs': docs})
 
 
 @login_required
+@staff_required
 def document_upload(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     if request.method == 'POST':
-        form = DocumentUploadForm(request.POST, request.FILES)
-        if form.is_valid():
-            d = form.save(commit=False)
-            d.uploaded_by = request.user
-            d.save()
-            messages.success(request, 'Document uploaded.')
-            return redirect('dashboard:documents_list')
+        form = DocumentUploadForm(request.POST, request.FILES, uploader=request.user)
+        try:
+            if form.is_valid():
+                d = form.save(commit=False)
+                d.uploaded_by = request.user
+                d.save()
+                form.release_uploads()
+                messages.success(request, 'Document uploaded.')
+                return redirect('dashboard:documents_list')
+        finally:
+            form.close_uploads()
     else:
         form = DocumentUploadForm()
     return render(request, 'dashboard/staff/document_upload.html', {'form': form})
 
 
 @login_required
+@staff_required
 def faculty_dashboard(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     return render(request, 'dashboard/faculty/index.html', {})
 
 
 @login_required
+@staff_required
 def faculty_course_builder(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     return render(request, 'dashboard/faculty/course_builder.html', {})
 
 
 @login_required
+@staff_required
 def faculty_grade_submissions(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     return render(request, 'dashboard/faculty/grade_submissions.html', {})
 
 
 @login_required
+@staff_required
 def faculty_staff_coordination(request):
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('dashboard:index')
     return render(request, 'dashboard/faculty/staff_coordination.html', {})
+
+
+def _upload_state(upload):
+    return {
+        'id': str(upload.pk),
+        'filename': upload.filename,
+        'size': upload.size,
+        'offset': upload.offset,
+        'complete': upload.is_complete,
+        'sha256': upload.sha256 or None,
+        'chunk_size': uploads.chunk_size(),
+    }
+
+
+@login_required
+@require_http_methods(['POST'])
+def upload_start(request):
+    """Open a chunked upload session: POST ``filename``, ``size`` and optionally ``sha256``."""
+    try:
+        size = int(request.POST.get('size', ''))
+        upload = uploads.start_upload(
+            request.user, request.POST.get('filename', ''), size, request.POST.get('sha256', ''),
+        )
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(_upload_state(upload), status=201)
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD', 'PUT', 'DELETE'])
+def upload_chunk(request, upload_id):
+    """GET reports the resume offset, PUT appends a chunk, DELETE abandons the upload.
+
+    A PUT body is the raw chunk, written at the offset given in the
+    ``Upload-Offset`` header; it must equal the session's current offset.
+    """
+    upload = get_object_or_404(ChunkedUpload, pk=upload_id, owner=request.user)
+    if request.method == 'DELETE':
+        uploads.discard_upload(upload)
+        return JsonResponse({'id': str(upload_id), 'deleted': True})
+    if request.method == 'PUT':
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+            # Read from the request stream directly so the chunk is never
+            # buffered into request.body.
+            uploads.append_chunk(upload, request, offset, length)
+        except uploads.OffsetMismatch as exc:
+            return JsonResponse({'error': str(exc), **_upload_state(upload)}, status=409)
+        except uploads.ChecksumMismatch as exc:
+            # The session is gone; there is no state left to report.
+            return JsonResponse({'error': str(exc), 'id': str(upload_id), 'deleted': True}, status=400)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc), **_upload_state(upload)}, status=400)
+    return JsonResponse(_upload_state(upload))
+
+
+@login_required
+def notifications_inbox(request):
+    """The user's notifications, newest first, a keyset page at a time."""
+    unread_only = request.GET.get('filter') == 'unread'
+    items = Notification.objects.filter(recipient=request.user).only('message', 'created_at', 'read')
+    if unread_only:
+        items = items.filter(read=False)
+    try:
+        page = keyset_page(
+            items, NOTIFICATIONS_PER_PAGE, 'created_at',
+            after=request.GET.get('after'), before=request.GET.get('before'),
+        )
+    except ValueError:
+        page = keyset_page(items, NOTIFICATIONS_PER_PAGE, 'created_at')
+    return render(request, 'dashboard/notifications.html', {
+        'notifications': page,
+        'page_obj': page,
+        'unread_only': unread_only,
+        'filter_query': 'filter=unread' if unread_only else '',
+    })
+
+
+@login_required
+@require_http_methods(['POST'])
+def notifications_mark_all_read(request):
+    updated = notifications.mark_all_read(request.user)
+    if updated:
+        messages.success(request, f'{updated} notification(s) marked as read.')
+    return redirect('dashboard:notifications')
+
+
+@login_required
+@require_http_methods(['POST'])
+def notification_mark_read(request, pk):
+    Notification.objects.filter(pk=pk, recipient=request.user, read=False).update(read=True)
+    notifications.invalidate_unread([request.user.pk])
+    next_url = request.POST.get('next', '')
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = 'dashboard:notifications'
+    return redirect(next_url)
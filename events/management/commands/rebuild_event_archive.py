@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from events.models import ArchiveMonth
+
+
+class Command(BaseCommand):
+    help = ('Recount the per-month event totals behind the events archive, e.g. after '
+            'events were changed with queryset update() or raw SQL, which skip the signals.')
+
+    def handle(self, *args, **options):
+        months = ArchiveMonth.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the archive: {months} month(s) with events.'))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:55
+
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def build_archive_months(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    ArchiveMonth = apps.get_model('events', 'ArchiveMonth')
+    rows = (
+        Event.objects.annotate(bucket=TruncMonth('date'))
+        .values('bucket').annotate(total=models.Count('id')).order_by()
+    )
+    ArchiveMonth.objects.bulk_create([
+        ArchiveMonth(year=row['bucket'].year, month=row['bucket'].month, count=row['total'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date'], name='events_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='events_archive_month_unique'),
+        ),
+        migrations.RunPython(build_archive_months, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_archivemonth_event_date_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='slug',
+            field=models.SlugField(blank=True, unique=True),
+        ),
+    ]
@@ -1,10 +1,17 @@
 # events/models.py
-from django.db import models
+from datetime import datetime
+
+from django.db import models, transaction
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+from core.slugs import save_with_unique_slug
+
 class Event(models.Model):
     title = models.CharField(max_length=200)
-    slug = models.SlugField(unique=True)
+    slug = models.SlugField(unique=True, blank=True)
     description = models.TextField()
     content = models.TextField(blank=True)
     image = models.ImageField(upload_to='events/', blank=True, null=True)
@@ -16,6 +23,99 @@ class Event(models.Model):
     class Meta:
         verbose_name_plural = "Events"
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date'], name='events_date_idx'),
+        ]
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        save = super().save
+        save_with_unique_slug(self, self.title, lambda: save(*args, **kwargs))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so a save that moves the event can refresh the month it left.
+        instance._loaded_date = instance.__dict__.get('date')
+        return instance
+
+
+def month_bounds(year, month):
+    """Aware [start, end) datetimes for a calendar month in the current timezone."""
+    start = timezone.make_aware(datetime(year, month, 1))
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1))
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1))
+    return start, end
+
+
+class ArchiveMonth(models.Model):
+    """Precomputed number of events per calendar month for the archive."""
+
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month'], name='events_archive_month_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} ({self.count})"
+
+    @property
+    def start(self):
+        return month_bounds(self.year, self.month)[0]
+
+    @classmethod
+    def refresh(cls, year, month):
+        start, end = month_bounds(year, month)
+        count = Event.objects.filter(date__gte=start, date__lt=end).count()
+        if count:
+            cls.objects.update_or_create(year=year, month=month, defaults={'count': count})
+        else:
+            cls.objects.filter(year=year, month=month).delete()
+
+    @classmethod
+    def rebuild(cls):
+        """Recount every month from scratch; returns the number of months."""
+        rows = (
+            Event.objects.annotate(bucket=TruncMonth('date'))
+            .values('bucket').annotate(total=models.Count('id')).order_by()
+        )
+        months = [
+            cls(year=row['bucket'].year, month=row['bucket'].month, count=row['total'])
+            for row in rows
+        ]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(months)
+        return len(months)
+
+
+def _month_of(value):
+    local = timezone.localtime(value)
+    return local.year, local.month
+
+
+@receiver(post_save, sender=Event)
+def refresh_archive_on_save(sender, instance, **kwargs):
+    months = {_month_of(instance.date)}
+    loaded = getattr(instance, '_loaded_date', None)
+    if loaded is not None:
+        months.add(_month_of(loaded))
+    for year, month in months:
+        ArchiveMonth.refresh(year, month)
+    instance._loaded_date = instance.date
+
+
+@receiver(post_delete, sender=Event)
+def refresh_archive_on_delete(sender, instance, **kwargs):
+    ArchiveMonth.refresh(*_month_of(instance.date))
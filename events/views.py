@@ -1,16 +1,62 @@
 # events/views.py
+from django.core.paginator import Paginator
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
-from .models import Event
+from .models import ArchiveMonth, Event, month_bounds
+from core.page_cache import cache_public_page
 
+PAST_EVENTS_PER_PAGE = 10
+
+
+def _archive_buckets(now):
+    """Year/month buckets of past events, newest first.
+
+    Closed months come straight from ArchiveMonth; only the current month is
+    counted live, since its events turn into past ones as the days go by.
+    """
+    this_month, _ = month_bounds(now.year, now.month)
+    buckets = [
+        {'year': b.year, 'month': b.month, 'start': b.start, 'count': b.count}
+        for b in ArchiveMonth.objects.filter(
+            year__lte=now.year,
+        ).exclude(year=now.year, month__gte=now.month)
+    ]
+    current = Event.objects.filter(date__gte=this_month, date__lt=now).count()
+    if current:
+        buckets.insert(0, {'year': now.year, 'month': now.month, 'start': this_month, 'count': current})
+    return buckets
+
+
+def _selected_month(request):
+    """Parse ``?month=YYYY-MM``; anything else means the whole archive."""
+    try:
+        year, month = (int(part) for part in request.GET.get('month', '').split('-'))
+        month_bounds(year, month)
+    except ValueError:
+        return None
+    return year, month
+
+
+@cache_public_page('events', query=('month', 'page'))
 def event_list(request):
     try:
-        upcoming_events = Event.objects.filter(date__gte=timezone.now()).order_by('date')
-        past_events = Event.objects.filter(date__lt=timezone.now()).order_by('-date')
+        # One timestamp so the upcoming and past querysets split at the same instant.
+        now = timezone.localtime()
+        upcoming_events = Event.objects.filter(date__gte=now).order_by('date')
+
+        past_events = Event.objects.filter(date__lt=now).order_by('-date')
+        selected = _selected_month(request)
+        if selected:
+            start, end = month_bounds(*selected)
+            past_events = past_events.filter(date__gte=start, date__lt=end)
+        past_page = Paginator(past_events, PAST_EVENTS_PER_PAGE).get_page(request.GET.get('page'))
         
         context = {
             'upcoming_events': upcoming_events,
-            'past_events': past_events,
+            'past_events': past_page,
+            'page_obj': past_page,
+            'archive_buckets': _archive_buckets(now),
+            'selected_month': '%d-%02d' % selected if selected else '',
         }
     except Exception as e:
         # Fallback if there's any issue
@@ -21,6 +67,7 @@ def event_list(request):
     
     return render(request, 'events/event_list.html', context)
 
+
 def event_detail(request, slug):
     try:
         event = get_object_or_404(Event, slug=slug)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'task')
+    search_fields = ('idempotency_key',)
+    readonly_fields = ('created_at', 'finished_at', 'locked_by', 'locked_at', 'last_error')
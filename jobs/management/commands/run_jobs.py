@@ -0,0 +1,35 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.queue import run_worker, schedule_purge
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (notifications, email) until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=getattr(settings, 'JOBS_WORKER_THREADS', 4),
+                            help='Size of the thread pool; 1 runs jobs in the main thread.')
+        parser.add_argument('--batch', type=int, default=50, help='Jobs claimed per round.')
+        parser.add_argument('--poll', type=float, default=2.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Exit once no jobs are due.')
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+
+        def shutdown(signum, frame):
+            # Finish the jobs in hand, then exit.
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        # Starts the jobs.purge chain; a no-op while a run is already queued.
+        schedule_purge()
+        processed = run_worker(
+            threads=options['threads'], limit=options['batch'],
+            poll=options['poll'], once=options['once'], stop=stop,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s).'))
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('idempotency_key',), name='jobs_active_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,256 @@
+# jobs/queue.py
+"""Database-backed job queue.
+
+Apps declare handlers in their ``tasks.py`` with ``@task``; request code calls
+``enqueue()``, which is a single INSERT, and ``manage.py run_jobs`` does the
+slow part (SMTP, fan-out) on a thread pool.
+
+Delivery is at-least-once: a job whose worker died is handed out again once
+its lock goes stale, and a failed job is retried with exponential backoff
+until ``max_attempts``. Handlers declared with ``batch_by`` receive every
+claimed payload that shares a key at once, which is how several emails to
+the same person become one message.
+
+Finished and failed jobs are kept for ``JOBS_RETENTION_DAYS`` and then
+deleted by the ``jobs.purge`` job, which ``run_jobs`` schedules when it
+starts and which queues its own next run, like ``core.purge_sessions``.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+PURGE_TASK = 'jobs.purge'
+
+_registry = {}
+
+
+class Task:
+    def __init__(self, name, func, batch_by=None, max_attempts=5, atomic=True):
+        self.name = name
+        self.func = func
+        self.batch_by = batch_by
+        self.max_attempts = max_attempts
+        self.atomic = atomic
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+
+def task(name, batch_by=None, max_attempts=5, atomic=True):
+    """Register the decorated function as the handler for ``name``.
+
+    A plain handler is called with one payload dict. With ``batch_by`` (a
+    payload key) it is called with a list of payloads sharing that key.
+    Handlers run in one transaction unless ``atomic=False``, for long jobs
+    that commit their own bounded chunks and are safe to resume.
+    """
+    def decorator(func):
+        _registry[name] = Task(name, func, batch_by=batch_by, max_attempts=max_attempts, atomic=atomic)
+        return func
+    return decorator
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def _job(task_name, payload, key=None, run_at=None):
+    handler = get_task(task_name)
+    return Job(
+        task=task_name,
+        payload=payload,
+        idempotency_key=key,
+        run_at=run_at or timezone.now(),
+        max_attempts=handler.max_attempts if handler else 5,
+    )
+
+
+def enqueue(task_name, payload, key=None, run_at=None):
+    """Queue one job, ignoring it if a pending or running job has ``key``."""
+    Job.objects.bulk_create([_job(task_name, payload, key, run_at)], ignore_conflicts=True)
+
+
+def enqueue_many(task_name, items, batch_size=500):
+    """Queue ``(payload, key)`` pairs in chunked INSERTs."""
+    jobs = [_job(task_name, payload, key) for payload, key in items]
+    Job.objects.bulk_create(jobs, batch_size=batch_size, ignore_conflicts=True)
+    return len(jobs)
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _lock_timeout():
+    return timedelta(seconds=getattr(settings, 'JOBS_LOCK_TIMEOUT', 300))
+
+
+def backoff(attempts):
+    """Delay before retry number ``attempts``: exponential with jitter."""
+    base = getattr(settings, 'JOBS_RETRY_BASE_DELAY', 30)
+    cap = getattr(settings, 'JOBS_RETRY_MAX_DELAY', 60 * 60)
+    delay = min(base * (2 ** (attempts - 1)), cap)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def requeue_stale():
+    """Hand jobs locked by a dead worker back to the queue."""
+    return Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=timezone.now() - _lock_timeout(),
+    ).update(status=Job.PENDING, locked_by='', locked_at=None)
+
+
+def claim(worker, limit):
+    """Lock up to ``limit`` due jobs for ``worker`` and return them."""
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.PENDING, run_at__lte=now).order_by('run_at', 'id')
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('id', flat=True)[:limit])
+        # The status condition keeps two workers from taking the same row
+        # on databases without SKIP LOCKED.
+        Job.objects.filter(id__in=ids, status=Job.PENDING).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now,
+        )
+    return list(Job.objects.filter(id__in=ids, status=Job.RUNNING, locked_by=worker))
+
+
+def group_jobs(jobs):
+    """Split claimed jobs into units of work: single jobs or per-key batches."""
+    units = []
+    batches = defaultdict(list)
+    for job in jobs:
+        handler = get_task(job.task)
+        if handler and handler.batch_by:
+            batches[(job.task, job.payload.get(handler.batch_by))].append(job)
+        else:
+            units.append([job])
+    units.extend(batches.values())
+    return units
+
+
+def run_unit(jobs):
+    """Run one unit of work and record the outcome on its jobs."""
+    handler = get_task(jobs[0].task)
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for {jobs[0].task!r}.')
+        # Database side effects of a failed attempt are rolled back, so a
+        # retry starts clean.
+        with transaction.atomic() if handler.atomic else nullcontext():
+            if handler.batch_by:
+                handler([job.payload for job in jobs])
+            else:
+                handler(jobs[0].payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Job %s failed', ', '.join(str(j.pk) for j in jobs), exc_info=True)
+        now = timezone.now()
+        for job in jobs:
+            job.attempts += 1
+            job.last_error = error
+            job.locked_by, job.locked_at = '', None
+            if job.attempts >= job.max_attempts:
+                job.status, job.finished_at = Job.FAILED, now
+            else:
+                job.status, job.run_at = Job.PENDING, now + backoff(job.attempts)
+        Job.objects.bulk_update(
+            jobs, ['attempts', 'last_error', 'locked_by', 'locked_at', 'status', 'run_at', 'finished_at'],
+        )
+        return False
+    Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+        status=Job.DONE, attempts=F('attempts') + 1, finished_at=timezone.now(),
+        locked_by='', locked_at=None, last_error='',
+    )
+    return True
+
+
+def _run_in_thread(jobs):
+    try:
+        return run_unit(jobs)
+    finally:
+        # Each pool thread has its own connection; don't leak it.
+        connection.close()
+
+
+def run_once(pool, worker, limit):
+    """Claim and run one round of jobs; returns how many were claimed.
+
+    With ``pool=None`` the units run one after another in this thread.
+    """
+    requeue_stale()
+    jobs = claim(worker, limit)
+    units = group_jobs(jobs)
+    if pool is None:
+        for unit in units:
+            run_unit(unit)
+    else:
+        list(pool.map(_run_in_thread, units))
+    return len(jobs)
+
+
+def run_worker(threads=4, limit=50, poll=2.0, once=False, stop=None):
+    """Process jobs until ``stop`` is set (or the queue is empty, with ``once``)."""
+    stop = stop or threading.Event()
+    worker = worker_id()
+    processed = 0
+    pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='jobs') if threads > 1 else None
+    try:
+        while not stop.is_set():
+            claimed = run_once(pool, worker, limit)
+            processed += claimed
+            if not claimed:
+                if once:
+                    break
+                stop.wait(poll)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    return processed
+
+
+def purge_finished(now=None, chunk_size=1000, pause=0.05):
+    """Delete done and failed jobs older than the retention; returns the count."""
+    days = getattr(settings, 'JOBS_RETENTION_DAYS', 7)
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    finished = Job.objects.filter(status__in=[Job.DONE, Job.FAILED], finished_at__lt=cutoff)
+    removed = 0
+    while True:
+        ids = list(finished.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            removed += Job.objects.filter(id__in=ids).delete()[0]
+        if len(ids) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return removed
+
+
+def schedule_purge(now=None):
+    """Queue the next purge at the coming interval boundary; returns its time."""
+    interval = getattr(settings, 'JOBS_PURGE_INTERVAL', 24 * 60 * 60)
+    now = now or timezone.now()
+    slot = int(now.timestamp() // interval) + 1
+    run_at = datetime.fromtimestamp(slot * interval, tz=dt_timezone.utc)
+    enqueue(PURGE_TASK, {}, key=f'{PURGE_TASK}:{slot}', run_at=run_at)
+    return run_at
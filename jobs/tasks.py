@@ -0,0 +1,36 @@
+# jobs/tasks.py
+from django.conf import settings
+from django.core.mail import EmailMessage
+
+from .queue import PURGE_TASK, enqueue_many, purge_finished, schedule_purge, task
+
+
+def queue_emails(messages):
+    """Queue ``(to, subject, body, key)`` tuples as ``email.send`` jobs."""
+    return enqueue_many('email.send', (
+        ({'to': to, 'subject': subject, 'body': body}, key)
+        for to, subject, body, key in messages
+    ))
+
+
+@task('email.send', batch_by='to')
+def send_email(payloads):
+    """Send everything queued for one address as a single message."""
+    to = payloads[0]['to']
+    if len(payloads) == 1:
+        subject = payloads[0]['subject']
+        body = payloads[0]['body']
+    else:
+        subject = f'{len(payloads)} new updates'
+        body = '\n\n----\n\n'.join(f"{p['subject']}\n\n{p['body']}" for p in payloads)
+    reply_to = [p['reply_to'] for p in payloads if p.get('reply_to')]
+    EmailMessage(
+        subject, body, settings.DEFAULT_FROM_EMAIL, [to], reply_to=reply_to[:1] or None,
+    ).send()
+
+
+@task(PURGE_TASK, atomic=False)
+def purge_jobs(payload):
+    # Queue the next run first, so a failing purge doesn't end the chain.
+    schedule_purge()
+    purge_finished()
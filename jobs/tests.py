@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim, enqueue, purge_finished, run_unit, task
+
+calls = []
+
+
+@task('tests.record')
+def record(payload):
+    calls.append(payload)
+    if payload.get('fail'):
+        raise RuntimeError('boom')
+
+
+@override_settings(JOBS_RETRY_BASE_DELAY=30)
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_locks_due_jobs_once(self):
+        enqueue('tests.record', {'n': 1})
+        enqueue('tests.record', {'n': 2}, run_at=timezone.now() + timedelta(hours=1))
+        jobs = claim('worker-a', 10)
+        self.assertEqual([job.payload for job in jobs], [{'n': 1}])
+        self.assertEqual(jobs[0].status, Job.RUNNING)
+        self.assertEqual(claim('worker-b', 10), [])
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        enqueue('tests.record', {'fail': True})
+        job = Job.objects.get()
+        job.max_attempts = 2
+        job.save()
+        self.assertFalse(run_unit(claim('worker', 1)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=20))
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        self.assertFalse(run_unit(claim('worker', 1)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertEqual(len(calls), 2)
+
+    def test_key_is_unique_among_active_jobs_only(self):
+        enqueue('tests.record', {'n': 1}, key='grade:1')
+        enqueue('tests.record', {'n': 2}, key='grade:1')
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertTrue(run_unit(claim('worker', 1)))
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+        enqueue('tests.record', {'n': 3}, key='grade:1')
+        self.assertEqual(list(Job.objects.filter(status=Job.PENDING).values_list('payload', flat=True)), [{'n': 3}])
+
+    @override_settings(JOBS_RETENTION_DAYS=7)
+    def test_purge_deletes_old_finished_jobs(self):
+        now = timezone.now()
+        old, recent, pending = (Job.objects.create(task='tests.record') for _ in range(3))
+        Job.objects.filter(pk=old.pk).update(status=Job.DONE, finished_at=now - timedelta(days=8))
+        Job.objects.filter(pk=recent.pk).update(status=Job.FAILED, finished_at=now - timedelta(days=1))
+        self.assertEqual(purge_finished(now=now, pause=0), 1)
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {recent.pk, pending.pk})
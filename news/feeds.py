@@ -0,0 +1,41 @@
+# news/feeds.py
+from django.contrib.syndication.views import Feed
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .views import NEWS_PER_PAGE, cursor_page
+
+
+class LatestNewsFeed(Feed):
+    """Atom feed of published news; ``?after=<cursor>`` pages into the archive."""
+
+    feed_type = Atom1Feed
+    title = 'NORSU Bayawan Campus News'
+    subtitle = 'Latest happenings and announcements from NORSU Bayawan Campus.'
+
+    def get_object(self, request, *args, **kwargs):
+        return cursor_page(request, NEWS_PER_PAGE)
+
+    def link(self):
+        return reverse('news:list')
+
+    def items(self, page):
+        return page.object_list
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return [item.get_category_display()]
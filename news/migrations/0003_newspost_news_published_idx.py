@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_alter_newspost_options_newspost_category_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newspost',
+            index=models.Index(fields=['is_published', 'published_date', 'id'], name='news_published_idx'),
+        ),
+    ]
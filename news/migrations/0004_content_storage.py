@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:03
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_newspost_news_published_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newspost',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.content_storage, upload_to='news/'),
+        ),
+    ]
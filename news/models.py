@@ -2,9 +2,17 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.utils.text import slugify
 from django.urls import reverse
 
+from core.slugs import save_with_unique_slug
+from core.storage import content_storage
+
+class NewsPostQuerySet(models.QuerySet):
+    def published(self):
+        """Posts readers can see: published, and not scheduled for later."""
+        return self.filter(is_published=True, published_date__lte=timezone.now())
+
+
 class NewsPost(models.Model):  # Changed from 'News' to 'NewsPost' to avoid conflicts
     CATEGORY_CHOICES = [
         ('announcement', 'Announcement'),
@@ -19,7 +27,7 @@ class NewsPost(models.Model):  # Changed from 'News' to 'NewsPost' to avoid conf
     slug = models.SlugField(unique=True, blank=True)
     excerpt = models.TextField(max_length=300, help_text="Short summary of the news")
     content = models.TextField()
-    image = models.ImageField(upload_to='news/', blank=True, null=True)
+    image = models.ImageField(upload_to='news/', blank=True, null=True, storage=content_storage)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='general')
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     published_date = models.DateTimeField(default=timezone.now)
@@ -28,24 +36,25 @@ class NewsPost(models.Model):  # Changed from 'News' to 'NewsPost' to avoid conf
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = NewsPostQuerySet.as_manager()
+
     class Meta:
         ordering = ['-published_date']
         verbose_name = 'News Post'
         verbose_name_plural = 'News Posts'
+        indexes = [
+            # Serves the keyset pagination of news_list and the feeds.
+            models.Index(fields=['is_published', 'published_date', 'id'], name='news_published_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-            # Ensure slug is unique
-            original_slug = self.slug
-            counter = 1
-            while NewsPost.objects.filter(slug=self.slug).exists():
-                self.slug = f'{original_slug}-{counter}'
-                counter += 1
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        save = super().save
+        save_with_unique_slug(self, self.title, lambda: save(*args, **kwargs))
 
     def get_absolute_url(self):
         return reverse('news:detail', kwargs={'slug': self.slug})
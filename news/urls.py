@@ -1,10 +1,14 @@
 # news/urls.py
 from django.urls import path
 from . import views
+from .feeds import LatestNewsFeed
+from core.page_cache import cache_public_page
 
 app_name = 'news'
 
 urlpatterns = [
     path('', views.news_list, name='list'),
+    path('feed/', views.news_feed, name='feed'),
+    path('feed/atom/', cache_public_page('news', query=('after', 'before'))(LatestNewsFeed()), name='atom'),
     path('<slug:slug>/', views.news_detail, name='detail'),
-]
\ No newline at end of file
+]
@@ -1,20 +1,50 @@
 # news/views.py
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
+from django.http import JsonResponse
 from .models import NewsPost
+from core.page_cache import cache_public_page
+from core.pagination import keyset_page
 
+NEWS_PER_PAGE = 9
+FEED_MAX_ITEMS = 50
+
+
+def published_news():
+    return NewsPost.objects.published().select_related('author')
+
+
+def cursor_page(request, per_page):
+    """Keyset page for ``?after=``/``?before=``; a bad cursor restarts at the top."""
+    try:
+        return keyset_page(
+            published_news(), per_page, 'published_date',
+            after=request.GET.get('after'), before=request.GET.get('before'),
+        )
+    except ValueError:
+        return keyset_page(published_news(), per_page, 'published_date')
+
+
+@cache_public_page('news', query=('page', 'after', 'before'))
 def news_list(request):
     try:
-        news_list = NewsPost.objects.filter(is_published=True).order_by('-published_date')
-        paginator = Paginator(news_list, 9)
-        
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-        
+        if 'page' in request.GET:
+            # Numbered pages are kept for old links; new navigation uses cursors.
+            news_list = published_news().order_by('-published_date', '-pk')
+            paginator = Paginator(news_list, NEWS_PER_PAGE)
+
+            page_number = request.GET.get('page')
+            page_obj = paginator.get_page(page_number)
+            is_paginated = paginator.num_pages > 1
+        else:
+            page_obj = cursor_page(request, NEWS_PER_PAGE)
+            is_paginated = page_obj.has_other_pages()
+
         context = {
             'news_posts': page_obj,
             'page_obj': page_obj,
-            'is_paginated': paginator.num_pages > 1,
+            'is_paginated': is_paginated,
+            'cursor_mode': 'page' not in request.GET,
         }
     except Exception as e:
         # Fallback if there's any issue
@@ -26,19 +56,43 @@ def news_list(request):
     
     return render(request, 'news/news_list.html', context)
 
-def news_detail(request, slug):
+
+@cache_public_page('news', query=('limit', 'after', 'before'))
+def news_feed(request):
+    """JSON feed of published news, paged with the same cursors as the list."""
     try:
-        news = get_object_or_404(NewsPost, slug=slug, is_published=True)
-        # Template expects `news_post` variable name; provide both for compatibility
-        context = {
-            'news': news,
-            'news_post': news,
-        }
-    except Exception:
-        # Fallback if news not found
-        context = {
-            'news': None,
-            'news_post': None,
+        limit = min(int(request.GET.get('limit', NEWS_PER_PAGE)), FEED_MAX_ITEMS)
+    except ValueError:
+        limit = NEWS_PER_PAGE
+    page = cursor_page(request, max(limit, 1))
+    items = [
+        {
+            'id': post.pk,
+            'title': post.title,
+            'slug': post.slug,
+            'url': request.build_absolute_uri(post.get_absolute_url()),
+            'excerpt': post.excerpt,
+            'category': post.category,
+            'image': request.build_absolute_uri(post.image.url) if post.image else None,
+            'author': post.author.get_full_name() or post.author.username,
+            'published_date': post.published_date.isoformat(),
+            'is_featured': post.is_featured,
         }
-    
-    return render(request, 'news/news_detail.html', context)
\ No newline at end of file
+        for post in page
+    ]
+    return JsonResponse({
+        'items': items,
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    })
+
+
+def news_detail(request, slug):
+    # Unknown slugs and posts scheduled for later are a 404.
+    news = get_object_or_404(NewsPost.objects.published(), slug=slug)
+    # Template expects `news_post` variable name; provide both for compatibility
+    context = {
+        'news': news,
+        'news_post': news,
+    }
+    return render(request, 'news/news_detail.html', context)
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'kind', 'object_id', 'is_public', 'updated_at')
+    list_filter = ('kind', 'is_public')
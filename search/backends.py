@@ -0,0 +1,160 @@
+# search/backends.py
+"""Search backends.
+
+``SQLiteFTSBackend`` queries the FTS5 table that mirrors ``SearchDocument``
+and ranks with bm25, weighting title matches above body matches.
+``DatabaseBackend`` needs no extension and works on any database, at the cost
+of a scan per query. ``SEARCH_BACKEND`` picks one by dotted path; by default
+SQLite gets FTS5 and everything else the plain backend.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+from .models import SearchDocument
+
+FTS_TABLE = 'search_searchdocument_fts'
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+# Private-use markers around matches; swapped for <mark> after escaping.
+MARK_START, MARK_END = '\ue000', '\ue001'
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    object_id: int
+    title: str
+    url: str
+    published_at: datetime
+    snippet: str
+    rank: float = 0.0
+
+
+def query_terms(query):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def render_snippet(text):
+    html = escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+    return mark_safe(html)
+
+
+class BaseBackend:
+    def search(self, query, kinds=None, include_private=False, limit=20, offset=0):
+        """Up to ``limit`` SearchHits for ``query``, best first."""
+        raise NotImplementedError
+
+    def optimize(self):
+        pass
+
+
+class SQLiteFTSBackend(BaseBackend):
+    title_weight = 10.0
+    body_weight = 1.0
+    snippet_tokens = 24
+
+    def match_expression(self, terms):
+        # Each word becomes a quoted prefix query, so user input can't inject
+        # FTS5 operators and partial words still match.
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, query, kinds=None, include_private=False, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        where = [f'{FTS_TABLE} MATCH %s', '(d.published_at IS NULL OR d.published_at <= %s)']
+        params = [self.match_expression(terms), connection.ops.adapt_datetimefield_value(timezone.now())]
+        if kinds:
+            where.append('d.kind IN (%s)' % ', '.join(['%s'] * len(kinds)))
+            params.extend(kinds)
+        if not include_private:
+            where.append('d.is_public')
+        sql = f"""
+            SELECT d.kind, d.object_id, d.title, d.url, d.published_at,
+                   snippet({FTS_TABLE}, 1, %s, %s, '…', %s),
+                   bm25({FTS_TABLE}, %s, %s) AS rank
+            FROM {FTS_TABLE}
+            JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid
+            WHERE {' AND '.join(where)}
+            ORDER BY rank
+            LIMIT %s OFFSET %s
+        """
+        params = [MARK_START, MARK_END, self.snippet_tokens,
+                  self.title_weight, self.body_weight] + params + [limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [
+            SearchHit(
+                kind=kind, object_id=object_id, title=title, url=url,
+                published_at=self.parse_datetime(published_at),
+                snippet=render_snippet(snippet), rank=rank,
+            )
+            for kind, object_id, title, url, published_at, snippet, rank in rows
+        ]
+
+    @staticmethod
+    def parse_datetime(value):
+        # SQLite keeps datetimes as naive UTC text.
+        if not value:
+            return None
+        value = parse_datetime(value) if isinstance(value, str) else value
+        return value.replace(tzinfo=dt_timezone.utc) if timezone.is_naive(value) else value
+
+    def optimize(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('optimize')")
+
+
+class DatabaseBackend(BaseBackend):
+    snippet_chars = 160
+
+    def search(self, query, kinds=None, include_private=False, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        documents = SearchDocument.objects.filter(
+            Q(published_at__isnull=True) | Q(published_at__lte=timezone.now()),
+        )
+        for term in terms:
+            documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        if not include_private:
+            documents = documents.filter(is_public=True)
+        documents = documents.order_by('-published_at', '-id')[offset:offset + limit]
+        return [
+            SearchHit(
+                kind=d.kind, object_id=d.object_id, title=d.title, url=d.url,
+                published_at=d.published_at, snippet=self.snippet(d.body, terms),
+            )
+            for d in documents
+        ]
+
+    def snippet(self, body, terms):
+        lowered = body.lower()
+        start = min((i for i in (lowered.find(t) for t in terms) if i >= 0), default=0)
+        start = max(start - self.snippet_chars // 4, 0)
+        text = body[start:start + self.snippet_chars]
+        pattern = re.compile('|'.join(re.escape(t) for t in terms), re.IGNORECASE)
+        text = pattern.sub(lambda m: MARK_START + m.group(0) + MARK_END, text)
+        return render_snippet(('…' if start else '') + text + ('…' if len(body) > start + self.snippet_chars else ''))
+
+
+def get_backend():
+    path = getattr(settings, 'SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    return DatabaseBackend()
@@ -0,0 +1,168 @@
+# search/index.py
+"""What gets indexed, and the receivers that keep the index current.
+
+Each source maps a model to a ``kind`` and knows how to flatten an instance
+into a ``SearchDocument``. Saves and deletes update the matching document in
+the same transaction, so search results never point at rolled-back content.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils.html import strip_tags
+
+from academics.models import Course, Department
+from dashboard.models import Announcement
+from events.models import Event
+from news.models import NewsPost
+
+from .models import SearchDocument
+
+
+def _text(*parts):
+    return '\n'.join(strip_tags(p) for p in parts if p)
+
+
+def news_document(post):
+    if not post.is_published:
+        return None
+    return {
+        'title': post.title,
+        'body': _text(post.excerpt, post.content),
+        'url': post.get_absolute_url(),
+        'published_at': post.published_date,
+    }
+
+
+def event_document(event):
+    return {
+        'title': event.title,
+        'body': _text(event.description, event.content, event.location),
+        'url': reverse('events:detail', kwargs={'slug': event.slug}),
+        'published_at': None,
+    }
+
+
+def department_document(department):
+    return {
+        'title': department.name,
+        'body': _text(department.description, department.head),
+        'url': reverse('academics:department_detail', kwargs={'pk': department.pk}),
+        'published_at': None,
+    }
+
+
+def course_document(course):
+    return {
+        'title': f"{course.code} - {course.title}",
+        'body': _text(course.description, course.requirements, course.department.name),
+        'url': reverse('academics:course_detail', kwargs={'pk': course.pk}),
+        'published_at': None,
+    }
+
+
+def announcement_document(announcement):
+    if not announcement.publish:
+        return None
+    return {
+        'title': announcement.title,
+        'body': _text(announcement.body),
+        # Announcements are shown on the dashboard, so only signed-in users
+        # get them in their results.
+        'url': reverse('dashboard:index'),
+        'published_at': announcement.created_at,
+        'is_public': False,
+    }
+
+
+# kind: (model, document builder, queryset used by a full rebuild)
+SOURCES = {
+    'news': (NewsPost, news_document, lambda: NewsPost.objects.filter(is_published=True)),
+    'event': (Event, event_document, lambda: Event.objects.all()),
+    'department': (Department, department_document, lambda: Department.objects.all()),
+    'course': (Course, course_document, lambda: Course.objects.select_related('department')),
+    'announcement': (Announcement, announcement_document, lambda: Announcement.objects.filter(publish=True)),
+}
+
+KIND_LABELS = {
+    'news': 'News',
+    'event': 'Events',
+    'department': 'Departments',
+    'course': 'Courses',
+    'announcement': 'Announcements',
+}
+
+
+def kind_for(model):
+    for kind, (source_model, _, _) in SOURCES.items():
+        if source_model is model:
+            return kind
+    return None
+
+
+def build_document(kind, instance):
+    """Unsaved SearchDocument for ``instance``, or None if it isn't searchable."""
+    fields = SOURCES[kind][1](instance)
+    if fields is None:
+        return None
+    return SearchDocument(kind=kind, object_id=instance.pk, **fields)
+
+
+def index_instance(instance):
+    kind = kind_for(type(instance))
+    document = build_document(kind, instance)
+    if document is None:
+        unindex_instance(instance)
+        return
+    fields = {f: getattr(document, f) for f in ('title', 'body', 'url', 'published_at', 'is_public')}
+    SearchDocument.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=fields)
+
+
+def unindex_instance(instance):
+    SearchDocument.objects.filter(kind=kind_for(type(instance)), object_id=instance.pk).delete()
+
+
+def rebuild(kinds=None, batch_size=500):
+    """Replace the documents of ``kinds`` (all by default); returns the count."""
+    total = 0
+    for kind in kinds or SOURCES:
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch = []
+        for instance in SOURCES[kind][2]().iterator(chunk_size=batch_size):
+            document = build_document(kind, instance)
+            if document is not None:
+                batch.append(document)
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+@receiver(post_save, sender=NewsPost, dispatch_uid='search-index-news')
+@receiver(post_save, sender=Event, dispatch_uid='search-index-event')
+@receiver(post_save, sender=Course, dispatch_uid='search-index-course')
+@receiver(post_save, sender=Announcement, dispatch_uid='search-index-announcement')
+def index_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_instance(instance)
+
+
+@receiver(post_save, sender=Department, dispatch_uid='search-index-department')
+def index_department(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_instance(instance)
+    # Course documents carry their department's name.
+    for course in instance.course_set.all():
+        index_instance(course)
+
+
+@receiver(post_delete, sender=NewsPost, dispatch_uid='search-unindex-news')
+@receiver(post_delete, sender=Event, dispatch_uid='search-unindex-event')
+@receiver(post_delete, sender=Department, dispatch_uid='search-unindex-department')
+@receiver(post_delete, sender=Course, dispatch_uid='search-unindex-course')
+@receiver(post_delete, sender=Announcement, dispatch_uid='search-unindex-announcement')
+def unindex_on_delete(sender, instance, **kwargs):
+    unindex_instance(instance)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.backends import get_backend
+from search.index import SOURCES, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the site search index from news, events, departments, courses and announcements.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', action='append', choices=sorted(SOURCES),
+                            help='Only rebuild this kind of document (may be repeated).')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        total = rebuild(options['kind'], batch_size=options['batch_size'])
+        # Merge the index segments written by the bulk inserts.
+        get_backend().optimize()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} document(s).'))
@@ -0,0 +1,27 @@
+# search/models.py
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """One indexed object, flattened to the text the search matches against.
+
+    On SQLite the ``search_searchdocument_fts`` FTS5 table mirrors ``title``
+    and ``body`` through triggers (see migration 0001), so writing these rows
+    through the ORM is all it takes to keep the full-text index current.
+    """
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=300)
+    published_at = models.DateTimeField(null=True, blank=True)
+    is_public = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from events.models import Event
+from news.models import NewsPost
+
+from .backends import DatabaseBackend, SQLiteFTSBackend
+
+
+class FTSSearchTests(TestCase):
+    backend_class = SQLiteFTSBackend
+
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user('editor')
+        cls.post = NewsPost.objects.create(
+            title='Mangrove planting drive', excerpt="O'Brien Hall volunteers",
+            content='Students planted mangroves along the coast.', author=author,
+        )
+        NewsPost.objects.create(
+            title='Enrollment schedule', excerpt='Second semester',
+            content='Enrollment for mangrove studies opens on Monday.', author=author,
+        )
+        cls.event = Event.objects.create(
+            title='Coastal cleanup', description='Bring gloves.', date=timezone.now() + timedelta(days=3),
+        )
+
+    def search(self, query):
+        return [(hit.kind, hit.object_id) for hit in self.backend_class().search(query)]
+
+    def test_title_matches_rank_first(self):
+        hits = self.search('mangrove')
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(hits[0], ('news', self.post.pk))
+
+    def test_quotes_and_operators_are_plain_terms(self):
+        self.assertEqual(self.search("o'brien"), [('news', self.post.pk)])
+        self.assertEqual(self.search('"coastal" cleanup*'), [('event', self.event.pk)])
+        self.assertEqual(self.search('coastal NEAR('), [])
+        self.assertEqual(self.search('AND OR NOT'), [])
+        self.assertEqual(self.search('"'), [])
+
+    def test_updates_and_deletes_keep_the_index_in_step(self):
+        self.event.title = 'Reef survey'
+        self.event.save()
+        self.assertEqual(self.search('coastal'), [])
+        self.assertEqual(self.search('reef'), [('event', self.event.pk)])
+
+        self.post.is_published = False
+        self.post.save()
+        self.assertNotIn(('news', self.post.pk), self.search('mangrove'))
+
+        self.event.delete()
+        self.assertEqual(self.search('reef'), [])
+
+
+class DatabaseSearchTests(FTSSearchTests):
+    backend_class = DatabaseBackend
+
+    def test_title_matches_rank_first(self):
+        # No ranking here; results come newest first.
+        self.assertEqual(len(self.search('mangrove')), 2)
@@ -0,0 +1,46 @@
+# search/views.py
+from django.shortcuts import render
+
+from .backends import get_backend, query_terms
+from .index import KIND_LABELS
+
+RESULTS_PER_PAGE = 20
+MAX_PAGE = 50
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()[:200]
+    kind = request.GET.get('kind', '')
+    if kind not in KIND_LABELS:
+        kind = ''
+    try:
+        page = min(max(int(request.GET.get('page', 1)), 1), MAX_PAGE)
+    except ValueError:
+        page = 1
+
+    results = []
+    has_next = False
+    if query_terms(query):
+        # Fetch one extra hit to know whether there is a next page without
+        # counting every match.
+        results = get_backend().search(
+            query,
+            kinds=[kind] if kind else None,
+            include_private=request.user.is_authenticated,
+            limit=RESULTS_PER_PAGE + 1,
+            offset=(page - 1) * RESULTS_PER_PAGE,
+        )
+        has_next = len(results) > RESULTS_PER_PAGE and page < MAX_PAGE
+        results = results[:RESULTS_PER_PAGE]
+        for hit in results:
+            hit.kind_label = KIND_LABELS.get(hit.kind, hit.kind)
+
+    return render(request, 'search/results.html', {
+        'query': query,
+        'kind': kind,
+        'kinds': KIND_LABELS,
+        'results': results,
+        'page': page,
+        'has_next': has_next,
+        'has_previous': page > 1,
+    })
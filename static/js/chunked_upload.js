@@ -0,0 +1,176 @@
+// static/js/chunked_upload.js
+// Sends the file inputs of forms marked with data-chunked-upload through the
+// resumable upload API (dashboard/uploads.py) before the form itself is
+// submitted, so large files survive flaky connections and never hit the
+// server as one request body. Forms still work without JavaScript.
+(function () {
+    'use strict';
+
+    var MAX_RETRIES = 5;
+
+    function csrfToken(form) {
+        var input = form.querySelector('input[name="csrfmiddlewaretoken"]');
+        return input ? input.value : '';
+    }
+
+    function sleep(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+
+    function storageKey(file) {
+        return 'chunked-upload:' + [file.name, file.size, file.lastModified].join(':');
+    }
+
+    // Hex SHA-256 of the whole file, checked by the server once the last
+    // chunk is in. Web Crypto only exists in secure contexts; without it the
+    // upload goes ahead unchecked.
+    function fileDigest(file) {
+        if (!window.crypto || !window.crypto.subtle) {
+            return Promise.resolve('');
+        }
+        return file.arrayBuffer().then(function (buffer) {
+            return window.crypto.subtle.digest('SHA-256', buffer);
+        }).then(function (digest) {
+            return Array.prototype.map.call(new Uint8Array(digest), function (byte) {
+                return ('0' + byte.toString(16)).slice(-2);
+            }).join('');
+        }, function () { return ''; });
+    }
+
+    function request(url, options) {
+        return fetch(url, Object.assign({ credentials: 'same-origin' }, options)).then(function (response) {
+            return response.json().then(function (data) {
+                if (!response.ok && response.status !== 409) {
+                    var error = new Error(data.error || ('Upload failed (' + response.status + ')'));
+                    error.fatal = response.status === 400 || response.status === 404;
+                    throw error;
+                }
+                return data;
+            });
+        });
+    }
+
+    function startSession(form, file) {
+        var token = csrfToken(form);
+        var saved = window.localStorage && localStorage.getItem(storageKey(file));
+        var resume = saved
+            ? request(form.dataset.uploadUrl + saved + '/', { headers: { 'X-CSRFToken': token } })
+                .catch(function () { return null; })
+            : Promise.resolve(null);
+        return resume.then(function (state) {
+            if (state && !state.error && state.size === file.size) {
+                return state;
+            }
+            return fileDigest(file).then(function (sha256) {
+                var body = new FormData();
+                body.append('filename', file.name);
+                body.append('size', file.size);
+                if (sha256) {
+                    body.append('sha256', sha256);
+                }
+                return request(form.dataset.uploadUrl, {
+                    method: 'POST',
+                    headers: { 'X-CSRFToken': token },
+                    body: body
+                });
+            }).then(function (created) {
+                if (window.localStorage) {
+                    localStorage.setItem(storageKey(file), created.id);
+                }
+                return created;
+            });
+        });
+    }
+
+    function sendChunks(form, file, state, progress) {
+        var token = csrfToken(form);
+        var url = form.dataset.uploadUrl + state.id + '/';
+        var failures = 0;
+
+        function next(current) {
+            progress(current.offset, file.size);
+            if (current.complete) {
+                if (window.localStorage) {
+                    localStorage.removeItem(storageKey(file));
+                }
+                return Promise.resolve(current);
+            }
+            var end = Math.min(current.offset + current.chunk_size, file.size);
+            return request(url, {
+                method: 'PUT',
+                headers: {
+                    'X-CSRFToken': token,
+                    'Upload-Offset': String(current.offset),
+                    'Content-Type': 'application/octet-stream'
+                },
+                body: file.slice(current.offset, end)
+            }).then(function (updated) {
+                failures = 0;
+                return next(updated);
+            }, function (error) {
+                failures += 1;
+                if (error.fatal || failures > MAX_RETRIES) {
+                    throw error;
+                }
+                // Ask the server where it got to and carry on from there.
+                return sleep(500 * Math.pow(2, failures)).then(function () {
+                    return request(url, { headers: { 'X-CSRFToken': token } });
+                }).then(next);
+            });
+        }
+
+        return next(state);
+    }
+
+    function uploadInput(form, input) {
+        var file = input.files[0];
+        var status = document.createElement('p');
+        status.className = 'text-sm text-gray-600 mt-1';
+        input.insertAdjacentElement('afterend', status);
+        function progress(offset, size) {
+            status.textContent = 'Uploading ' + file.name + ': ' + Math.floor(offset * 100 / size) + '%';
+        }
+        return startSession(form, file).then(function (state) {
+            return sendChunks(form, file, state, progress);
+        }).then(function (state) {
+            form.querySelector('input[name="' + input.name + '_upload"]').value = state.id;
+            // The server already has the file; don't send it a second time.
+            input.value = '';
+            status.textContent = file.name + ' uploaded.';
+        }, function (error) {
+            status.textContent = error.message;
+            status.className = 'text-sm text-red-600 mt-1';
+            throw error;
+        });
+    }
+
+    function bind(form) {
+        form.addEventListener('submit', function (event) {
+            if (form.dataset.uploadsDone) {
+                return;
+            }
+            var inputs = Array.prototype.filter.call(
+                form.querySelectorAll('input[type="file"]'),
+                function (input) {
+                    return input.files.length && form.querySelector('input[name="' + input.name + '_upload"]');
+                }
+            );
+            if (!inputs.length || !window.fetch) {
+                return;
+            }
+            event.preventDefault();
+            var buttons = form.querySelectorAll('button, input[type="submit"]');
+            buttons.forEach(function (button) { button.disabled = true; });
+            Promise.all(inputs.map(function (input) { return uploadInput(form, input); })).then(function () {
+                form.dataset.uploadsDone = '1';
+                form.submit();
+            }, function () {
+                buttons.forEach(function (button) { button.disabled = false; });
+            });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('form[data-chunked-upload]').forEach(bind);
+    });
+})();